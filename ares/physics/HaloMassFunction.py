@@ -777,25 +777,10 @@ class HaloMassFunction(object):
 
         # Collect results!
         if size > 1: # pragma: no cover
-            tmp2 = np.zeros_like(self.tab_dndm)
-            nothing = MPI.COMM_WORLD.Allreduce(self.tab_dndm, tmp2)
-            self.tab_dndm = tmp2
-
-            tmp3 = np.zeros_like(self.tab_ngtm)
-            nothing = MPI.COMM_WORLD.Allreduce(self.tab_ngtm, tmp3)
-            self.tab_ngtm = tmp3
-
-            tmp4 = np.zeros_like(self.tab_mgtm)
-            nothing = MPI.COMM_WORLD.Allreduce(self.tab_mgtm, tmp4)
-            self.tab_mgtm = tmp4
-
-            tmp6 = np.zeros_like(self.tab_ps_lin)
-            nothing = MPI.COMM_WORLD.Allreduce(self.tab_ps_lin, tmp6)
-            self.tab_ps_lin = tmp6
-
-            tmp7 = np.zeros_like(self.tab_growth)
-            nothing = MPI.COMM_WORLD.Allreduce(self.tab_growth, tmp7)
-            self.tab_growth = tmp7
+            # (reduce in place, so we don't need a second copy of each table)
+            for arr in [self.tab_dndm, self.tab_ngtm, self.tab_mgtm,
+                self.tab_ps_lin, self.tab_growth]:
+                MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, arr, op=MPI.SUM)
         ##
         # Done!
         ##
@@ -810,7 +795,8 @@ class HaloMassFunction(object):
         ##
 
 
-        pb = ProgressBar(self.tab_z.size+self.tab_M.size, 'mar')
+        pb = ProgressBar(self.tab_z.size+self.tab_M.size, 'mar',
+            use=self.pf['progress_bar'])
         pb.start()
 
         # First, do the cumulative number density calculation.
@@ -838,10 +824,7 @@ class HaloMassFunction(object):
 
 
         if size > 1: # pragma: no cover
-            tmp = np.zeros_like(self.tab_traj)
-            nothing = MPI.COMM_WORLD.Allreduce(self.tab_traj, tmp)
-            self.tab_traj = tmp.copy()
-            del tmp
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, self.tab_traj, op=MPI.SUM)
 
         # The first dimension is halo identity, the first self.tab_z.size
         # elements are halos with M=self.tab_M[0], the next self.tab_M.size
@@ -901,9 +884,7 @@ class HaloMassFunction(object):
         self._tab_MAR = arr
 
         if size > 1: # pragma: no cover
-            tmp = np.zeros_like(self.tab_MAR)
-            nothing = MPI.COMM_WORLD.Allreduce(self.tab_MAR, tmp)
-            self._tab_MAR = tmp
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, self._tab_MAR, op=MPI.SUM)
 
         ##
         # OK, *now* we're done.
@@ -4,11 +4,13 @@ import os
 import re
 import pickle
 import numpy as np
+import multiprocessing
 from ..data import ARES
 import scipy.special as sp
 from types import FunctionType
 from scipy.integrate import quad
 from scipy.interpolate import interp1d, Akima1DInterpolator
+from ..util.Math import fftlog_j0, simpson_weights
 from ..util.ProgressBar import ProgressBar
 from .Constants import rho_cgs, c, cm_per_mpc
 from .HaloMassFunction import HaloMassFunction
@@ -35,8 +37,45 @@ except ImportError:
 
 four_pi = 4 * np.pi
 
+# Set temporarily by HaloModel.TabulatePS so that forked worker processes
+# can get at the instance without having to pickle it.
+_tabulate_ps_instance = None
+
+def _tabulate_ps_one_z(args):
+    z, ftkwargs = args
+    return _tabulate_ps_instance._tabulate_ps_one_z(z, **ftkwargs)
+
+def _mu_nfw(c):
+    """ Dimensionless NFW mass within concentration `c`. """
+    return np.log1p(c) - c / (1. + c)
+
+def _u_nfw_kernel(c, K):
+    """
+    Normalized Fourier transform of an NFW profile with concentration `c`,
+    as a function of K = k * r_s. Pure function of arrays, so it's kept out
+    of the class and shared by all instances.
+    """
+
+    opcK = (1. + c) * K
+
+    asi, ac = sp.sici(opcK)
+    bs, bc = sp.sici(K)
+
+    # The extra factor of np.log(1 + c) - c / (1 + c)) comes in because
+    # there's really a normalization factor of 4 pi rho_s r_s^3 / m,
+    # and m = 4 pi rho_s r_s^3 * the log term
+    norm = 1. / _mu_nfw(c)
+
+    return norm * (np.sin(K) * (asi - bs) - np.sin(c * K) / opcK \
+        + np.cos(K) * (ac - bc))
+
 class HaloModel(HaloMassFunction):
 
+    # Power spectrum tables read from disk, keyed by (filename, mtime) so
+    # that rewritten files are re-read. Arrays are stored read-only since
+    # they are shared by all instances.
+    _shared_ps_tables = {}
+
     def mvir_to_rvir(self, m):
         return (3. * m / (4. * np.pi * self.pf['halo_delta'] \
             * self.cosm.mean_density0)) ** (1. / 3.)
@@ -53,7 +92,7 @@ class HaloModel(HaloMassFunction):
             raise NotImplemented('help!')
 
     def _cm_duffy(self, m, z, get_rs=True):
-        c = 6.71 * (m / (2e12)) ** -0.091 * (1 + z) ** -0.44
+        c = 6.71 * (m * 5e-13) ** -0.091 * (1 + z) ** -0.44
         rvir = self.mvir_to_rvir(m)
 
         if get_rs:
@@ -70,8 +109,12 @@ class HaloModel(HaloMassFunction):
         else:
             return c
 
+    def _mu_nfw(self, c):
+        """ Dimensionless NFW mass within concentration `c`. """
+        return _mu_nfw(c)
+
     def _dc_nfw(self, c):
-        return c** 3. / (4. * np.pi) / (np.log(1 + c) - c / (1 + c))
+        return c * c * c / four_pi / self._mu_nfw(c)
 
     def rho_nfw(self, r, m, z):
 
@@ -80,16 +123,14 @@ class HaloModel(HaloMassFunction):
         x = r / r_s
         rn = x / c
 
-        if np.iterable(x):
-            result = np.zeros_like(x)
-            result[rn <= 1] = (self._dc_nfw(c) / (c * r_s)**3 / (x * (1 + x)**2))[rn <= 1]
+        # Truncate at the virial radius.
+        result = np.where(rn <= 1,
+            self._dc_nfw(c) / (c * r_s)**3 / (x * (1 + x)**2), 0.0)
 
+        if np.iterable(x):
             return result
-        else:
-            if rn <= 1.0:
-                return self._dc_nfw(c) / (c * r_s) ** 3 / (x * (1 + x) ** 2)
-            else:
-                return 0.0
+
+        return float(result)
 
     def u_nfw(self, k, m, z):
         """
@@ -105,18 +146,7 @@ class HaloModel(HaloMassFunction):
         """
         c, r_s = self.cm_relation(m, z, get_rs=True)
 
-        K = k * r_s
-
-        asi, ac = sp.sici((1 + c) * K)
-        bs, bc = sp.sici(K)
-
-        # The extra factor of np.log(1 + c) - c / (1 + c)) comes in because
-        # there's really a normalization factor of 4 pi rho_s r_s^3 / m,
-        # and m = 4 pi rho_s r_s^3 * the log term
-        norm = 1. / (np.log(1 + c) - c / (1 + c))
-
-        return norm * (np.sin(K) * (asi - bs) - np.sin(c * K) / ((1 + c) * K) \
-            + np.cos(K) * (ac - bc))
+        return _u_nfw_kernel(c, k * r_s)
 
     def u_isl(self, k, m, z, rmax):
         """
@@ -149,11 +179,13 @@ class HaloModel(HaloMassFunction):
 
     def u_cgm_rahmati(self, k, m, z):
         rstar = 0.0025
-        return np.arctan((rstar * k) ** 0.75) / (rstar * k) ** 0.75
+        u = (rstar * k) ** 0.75
+        return np.arctan(u) / u
 
     def u_cgm_steidel(self, k, m, z):
         rstar = 0.2
-        return np.arctan((rstar * k) ** 0.85) / (rstar * k) ** 0.85
+        u = (rstar * k) ** 0.85
+        return np.arctan(u) / u
 
     def FluxProfile(self, r, m, z, lc=False):
         return m * self.ModulationFactor(z, r=r, lc=lc) / (4. * np.pi * r**2)
@@ -209,19 +241,16 @@ class HaloModel(HaloMassFunction):
 
         """
 
-        if type(k) == np.ndarray:
-            integ1 = []; integ2 = []
-            for _k in k:
-                _integ1, _integ2 = self._integrate_over_prof(_k, iz,
-                    prof1, prof2, lum1, lum2, mmin1, mmin2, term)
-                integ1.append(_integ1)
-                integ2.append(_integ2)
+        scalar = np.ndim(k) == 0
+        k = np.atleast_1d(np.asarray(k, dtype=np.float64))
 
-            integ1 = np.array(integ1)
-            integ2 = np.array(integ2)
-        else:
-            integ1, integ2 = self._integrate_over_prof(k, iz,
-                prof1, prof2, lum1, lum2, mmin1, mmin2, term)
+        integ1, integ2 = self._integrate_over_prof(k, iz,
+            prof1, prof2, lum1, lum2, mmin1, mmin2, term)
+
+        if scalar:
+            integ1 = integ1[0]
+            if integ2 is not None:
+                integ2 = integ2[0]
 
         return integ1, integ2
 
@@ -230,87 +259,140 @@ class HaloModel(HaloMassFunction):
         """
         Compute integrals over profile, weighted by bias, dndm, etc.,
         needed for halo model.
-        """
 
-        p1 = np.abs([prof1(k, M, self.tab_z[iz]) for M in self.tab_M])
-        p2 = np.abs([prof2(k, M, self.tab_z[iz]) for M in self.tab_M])
+        .. note :: Profiles are evaluated once on the full (mass, k) grid,
+            so `k` must be an array. Integrals run over mass (axis 0), and
+            the results have the same shape as `k`.
+
+        """
 
         bias = self.tab_bias[iz]
         rho_bar = self.cosm.rho_m_z0 * rho_cgs
         dndlnm = self.tab_dndlnm[iz] # M * dndm
 
+        # Small halo correction. Make use of Cooray & Sheth Eq. 71
+        if ((mmin1 is None) and (lum1 is None)) or \
+           ((mmin2 is None) and (lum2 is None)):
+            _integrand = dndlnm * (self.tab_M / rho_bar) * bias
+            corr = 1. - np.dot(self._get_lnM_weights(self.tab_lnM), _integrand)
+
         if (mmin1 is None) and (lum1 is None):
             fcoll1 = 1.
-
-            # Small halo correction. Make use of Cooray & Sheth Eq. 71
-            _integrand = dndlnm * (self.tab_M / rho_bar) * bias
-            corr1 = 1. - np.trapz(_integrand, x=np.log(self.tab_M))
+            corr1 = corr
         elif lum1 is not None:
             corr1 = 0.0
             fcoll1 = 1.
         else:
-            fcoll1 = self.tab_fcoll[iz,np.argmin(np.abs(mmin1-self.tab_M))]
+            fcoll1 = self.tab_fcoll[iz,self._get_iM(mmin1)]
             corr1 = 0.0
 
         if (mmin2 is None) and (lum2 is None):
             fcoll2 = 1.#self.mgtm[iz,0] / rho_bar
-            _integrand = dndlnm * (self.tab_M / rho_bar) * bias
-            corr2 = 1. - np.trapz(_integrand, x=np.log(self.tab_M))
+            corr2 = corr
         elif lum2 is not None:
             corr2 = 0.0
             fcoll2 = 1.
         else:
-            fcoll2 = self.fcoll_2d(z, np.log10(Mmin_2))#self.fcoll_Tmin[iz]
+            fcoll2 = self.tab_fcoll[iz,self._get_iM(mmin2)]
             corr2 = 0.0
 
+        # Only halos with fcoll > 0 contribute, so restrict everything
+        # (including the profiles) to those masses up front.
         ok = self.tab_fcoll[iz] > 0
+        Mok = self.tab_M[ok==1]
+        lnMok = self.tab_lnM[ok==1]
 
         # If luminosities passed, then we must cancel out a factor of halo
         # mass that generally normalizes the integrand.
         if lum1 is None:
-            weight1 = self.tab_M
+            weight1 = Mok
             norm1 = rho_bar * fcoll1
         else:
-            weight1 = lum1
+            weight1 = lum1[ok==1] if np.ndim(lum1) else lum1
             norm1 = 1.
 
         if lum2 is None:
-            weight2 = self.tab_M
+            weight2 = Mok
             norm2 = rho_bar * fcoll2
         else:
-            weight2 = lum2
+            weight2 = lum2[ok==1] if np.ndim(lum2) else lum2
             norm2 = 1.
 
+        # Auto-power spectra (the usual case) only need one evaluation.
+        p1 = np.abs(prof1(k[None,:], Mok[:,None], self.tab_z[iz]))
+        if prof2 is prof1:
+            p2 = p1
+        else:
+            p2 = np.abs(prof2(k[None,:], Mok[:,None], self.tab_z[iz]))
+
+        dndlnm = dndlnm[ok==1]
+        w = self._get_lnM_weights(lnMok)
+
         ##
         # Are we doing the 1-h or 2-h term?
+        # (mass-dependent factors are reshaped to broadcast against the
+        # (nM, nk) profile arrays)
         if term == 1:
-            integrand = dndlnm * weight1 * weight2 * p1 * p2 / norm1 / norm2
+            integrand = (dndlnm * weight1 * weight2 / norm1 / norm2)[:,None] \
+                * p1 * p2
 
-            result = np.trapz(integrand[ok==1], x=np.log(self.tab_M[ok==1]))
+            result = np.dot(w, integrand)
 
             return result, None
 
         elif term == 2:
-            integrand1 = dndlnm * weight1 * p1 * bias / norm1
-            integrand2 = dndlnm * weight2 * p2 * bias / norm2
+            bias = bias[ok==1]
+            integrand1 = (dndlnm * weight1 * bias / norm1)[:,None] * p1
+            integrand2 = (dndlnm * weight2 * bias / norm2)[:,None] * p2
 
-            integral1 = np.trapz(integrand1[ok==1], x=np.log(self.tab_M[ok==1]),
-                axis=0)
-            integral2 = np.trapz(integrand2[ok==1], x=np.log(self.tab_M[ok==1]),
-                axis=0)
+            integral1 = np.dot(w, integrand1)
+            integral2 = np.dot(w, integrand2)
 
             return integral1 + corr1, integral2 + corr2
 
         else:
             raise NotImplemented('dunno man')
 
+    def _get_iM(self, M):
+        """
+        Index of the element of (sorted) tab_M closest to `M`.
+        """
+
+        iM = min(np.searchsorted(self.tab_M, M), self.tab_M.size - 1)
+        if iM > 0 and abs(self.tab_M[iM-1] - M) <= abs(self.tab_M[iM] - M):
+            iM -= 1
+
+        return iM
+
+    def _get_lnM_weights(self, lnM):
+        """
+        Simpson's rule weights for integrating over (a subset of) the
+        log-mass grid. Cached, since the grid is fixed.
+        """
+
+        # e.g., no halos above some minimum mass
+        if lnM.size == 0:
+            return np.zeros(0)
+
+        if not hasattr(self, '_lnM_weights'):
+            self._lnM_weights = {}
+
+        key = (lnM.size, lnM[0])
+        if key not in self._lnM_weights:
+            self._lnM_weights[key] = simpson_weights(lnM)
+
+        return self._lnM_weights[key]
+
     def _prep_for_ps(self, z, k, prof1, prof2, ztol):
         """
         Basic prep: fill prof1=None or prof2=None with defaults, determine
         the index of the requested redshift in our lookup tables.
         """
 
-        iz = np.argmin(np.abs(z - self.tab_z))
+        # Nearest redshift in (sorted) tab_z. Ties go to the lower index.
+        iz = min(np.searchsorted(self.tab_z, z), self.tab_z.size - 1)
+        if iz > 0 and abs(self.tab_z[iz-1] - z) <= abs(self.tab_z[iz] - z):
+            iz -= 1
 
         if abs(self.tab_z[iz] - z) > ztol:
             raise ValueError('Requested z={} not in grid (ztol={}).'.format(z,
@@ -338,11 +420,24 @@ class HaloModel(HaloMassFunction):
             k = self.tab_k_lin
             ps_lin = self.tab_ps_lin[iz]
         else:
-            ps_lin = np.exp(np.interp(np.log(k), np.log(self.tab_k_lin),
-                np.log(self.tab_ps_lin[iz])))
+            lnk, lnps = self._get_lntab_ps_lin()
+            ps_lin = np.exp(np.interp(np.log(k), lnk, lnps[iz]))
 
         return ps_lin
 
+    def _get_lntab_ps_lin(self):
+        """
+        Logs of the linear matter power spectrum table and its wavenumbers,
+        computed once (and again only if the tables are replaced).
+        """
+
+        if getattr(self, '_lntab_src', None) is not self.tab_ps_lin:
+            self._lntab_k_lin = np.log(self.tab_k_lin)
+            self._lntab_ps_lin = np.log(self.tab_ps_lin)
+            self._lntab_src = self.tab_ps_lin
+
+        return self._lntab_k_lin, self._lntab_ps_lin
+
     def get_ps_1h(self, z, k=None, prof1=None, prof2=None, lum1=None, lum2=None,
         mmin1=None, mmin2=None, ztol=1e-3):
         """
@@ -383,7 +478,7 @@ class HaloModel(HaloMassFunction):
 
         dndlnm = self.tab_dndlnm[iz]
         integrand = dndlnm * lum1 * lum2
-        shot = np.trapz(integrand, x=np.log(self.tab_M), axis=0)
+        shot = np.dot(self._get_lnM_weights(self.tab_lnM), integrand)
 
         return shot
 
@@ -397,7 +492,8 @@ class HaloModel(HaloMassFunction):
 
         return ps_1h + ps_2h
 
-    def CorrelationFunction(self, z, R, k=None, Pofk=None, load=True):
+    def CorrelationFunction(self, z, R, k=None, Pofk=None, load=True,
+        method=None):
         """
         Compute the correlation function of the matter power spectrum.
 
@@ -407,6 +503,11 @@ class HaloModel(HaloMassFunction):
             Redshift of interest.
         R : int, float, np.ndarray
             Scale(s) of interest
+        method : str, None
+            How to do the transform if not loading from table. Any `method`
+            accepted by InverseFT3D will work. If None, will use the
+            `ps_fht_method` parameter ('clenshaw-curtis' by default; set to
+            'fftlog' for a much faster transform).
 
         """
 
@@ -438,7 +539,10 @@ class HaloModel(HaloMassFunction):
             k = self.tab_k
             Pofk = self.get_ps_tot(z, self.tab_k)
 
-        return self.InverseFT3D(R, Pofk, k)
+        if method is None:
+            method = self.pf['ps_fht_method']
+
+        return self.InverseFT3D(R, Pofk, k, method=method)
 
     def InverseFT3D(self, R, ps, k=None, kmin=None, kmax=None,
         epsabs=1e-12, epsrel=1e-12, limit=500, split_by_scale=False,
@@ -477,6 +581,21 @@ class HaloModel(HaloMassFunction):
         if kmax is None:
             kmax = k.max()
 
+        ##
+        # FFTLog: no need to loop over scales, but need log-uniform k.
+        ##
+        if method == 'fftlog':
+            assert suppression == np.inf, \
+                "Suppression not supported with method='fftlog'!"
+
+            lnk = np.linspace(np.log(kmin), np.log(kmax), k.size)
+            kk = np.exp(lnk)
+            _R_, _cf_ = fftlog_j0(kk, four_pi * kk**3 * ps(lnk))
+
+            cf = np.interp(np.log(R), np.log(_R_), _cf_)
+
+            return cf / (2. * np.pi)**3
+
         norm = 1. / ps(np.log(kmax))
 
         ##
@@ -599,6 +718,18 @@ class HaloModel(HaloMassFunction):
         if Rmax is None:
             Rmax = R.max()
 
+        if method == 'fftlog':
+            assert suppression == np.inf, \
+                "Suppression not supported with method='fftlog'!"
+
+            lnR = np.linspace(np.log(Rmin), np.log(Rmax), R.size)
+            RR = np.exp(lnR)
+            _k_, _ps_ = fftlog_j0(RR, four_pi * RR**3 * cf(lnR))
+
+            ps = np.interp(np.log(k), np.log(_k_), _ps_)
+
+            return np.abs(ps)
+
         norm = 1. / cf(np.log(Rmin))
 
         if method == 'ogata':
@@ -696,6 +827,17 @@ class HaloModel(HaloMassFunction):
     def tab_k(self, value):
         self._tab_k = value
 
+    @property
+    def tab_lnM(self):
+        """
+        Natural log of halo mass grid, i.e., the integration variable
+        for all the halo model integrals.
+        """
+        if not hasattr(self, '_tab_lnM'):
+            self._tab_lnM = np.log(self.tab_M)
+
+        return self._tab_lnM
+
     @property
     def tab_R(self):
         """
@@ -772,14 +914,28 @@ class HaloModel(HaloMassFunction):
 
         fn = '%s/input/hmf/%s.%s' % (ARES, self.tab_prefix_ps(), suffix)
 
+        # Tables are shared by all instances that point to the same file,
+        # which saves re-reading (and storing) them when many HaloModel
+        # objects are created, e.g., during model grids.
+        try:
+            key = (fn, os.path.getmtime(fn))
+        except OSError:
+            key = None
+
+        if key in HaloModel._shared_ps_tables:
+            self.tab_z_ps, self.tab_R, self.tab_k, self.tab_ps_mm, \
+                self.tab_cf_mm = HaloModel._shared_ps_tables[key]
+            return
+
         if re.search('.hdf5', fn) or re.search('.h5', fn):
-            f = h5py.File(fn, 'r')
-            self.tab_z_ps = f['tab_z_ps'].value
-            self.tab_R = f['tab_R'].value
-            self.tab_k = f['tab_k'].value
-            self.tab_ps_mm = f['tab_ps_mm'].value
-            self.tab_cf_mm = f['tab_cf_mm'].value
-            f.close()
+            # Read straight into numpy arrays. Dataset.value was removed
+            # in h5py 3.0.
+            with h5py.File(fn, 'r') as f:
+                self.tab_z_ps = f['tab_z_ps'][()]
+                self.tab_R = f['tab_R'][()]
+                self.tab_k = f['tab_k'][()]
+                self.tab_ps_mm = f['tab_ps_mm'][()]
+                self.tab_cf_mm = f['tab_cf_mm'][()]
         elif re.search('.pkl', fn):
             f = open(fn, 'rb')
             self.tab_z_ps = pickle.load(f)
@@ -791,6 +947,27 @@ class HaloModel(HaloMassFunction):
         else:
             raise IOError('Unrecognized format for hps_table.')
 
+        if key is None:
+            return
+
+        tabs = (self.tab_z_ps, self.tab_R, self.tab_k, self.tab_ps_mm,
+            self.tab_cf_mm)
+        for tab in tabs:
+            if isinstance(tab, np.ndarray):
+                tab.setflags(write=False)
+
+        # Only keep the most recent version of each file.
+        HaloModel._forget_ps_tables(fn)
+        HaloModel._shared_ps_tables[key] = tabs
+
+    @staticmethod
+    def _forget_ps_tables(fn):
+        """ Drop any shared power spectrum tables read from file `fn`. """
+        path = os.path.abspath(fn)
+        for key in list(HaloModel._shared_ps_tables.keys()):
+            if os.path.abspath(key[0]) == path:
+                del HaloModel._shared_ps_tables[key]
+
     def tab_prefix_ps(self, with_size=True):
         """
         What should we name this table?
@@ -878,7 +1055,8 @@ class HaloModel(HaloMassFunction):
         Tabulate the matter power spectrum as a function of redshift and k.
         """
 
-        pb = ProgressBar(len(self.tab_z_ps), 'ps_dd')
+        pb = ProgressBar(len(self.tab_z_ps), 'ps_dd',
+            use=self.pf['progress_bar'])
         pb.start()
 
         # Lists to store any checkpoints that are found
@@ -951,6 +1129,8 @@ class HaloModel(HaloMassFunction):
 
         tab_ps_mm = np.zeros((len(self.tab_z_ps), len(self.tab_k)))
         tab_cf_mm = np.zeros((len(self.tab_z_ps), len(self.tab_R)))
+
+        todo = []
         for i, z in enumerate(self.tab_z_ps):
 
             # Done but not by me!
@@ -960,28 +1140,40 @@ class HaloModel(HaloMassFunction):
             if z not in my_assignments:
                 continue
 
-            ##
-            # Calculate from scratch
-            ##
-            print("Processor {} generating z={} PS and CF...".format(rank, z))
+            todo.append((i, z))
 
-            # Must interpolate back to fine grid (uniformly sampled
-            # real-space scales) to do FFT and obtain correlation function
-            tab_ps_mm[i] = self.get_ps_tot(z, self.tab_k)
+        def _collect(results):
+            for (i, z), (ps, cf) in zip(todo, results):
 
-            # Compute correlation function at native resolution to save time
-            # later.
-            tab_cf_mm[i] = self.InverseFT3D(self.tab_R, tab_ps_mm[i],
-                self.tab_k, **ftkwargs)
+                tab_ps_mm[i] = ps
+                tab_cf_mm[i] = cf
 
-            pb.update(i)
+                pb.update(i)
 
-            if not checkpoint:
-                continue
+                if not checkpoint:
+                    continue
 
-            with open(fn, 'ab') as f:
-                pickle.dump((z, tab_ps_mm[i], tab_cf_mm[i]), f)
-                #print("Processor {} wrote checkpoint for z={}".format(rank, z))
+                with open(fn, 'ab') as f:
+                    pickle.dump((z, tab_ps_mm[i], tab_cf_mm[i]), f)
+                    #print("Processor {} wrote checkpoint for z={}".format(rank, z))
+
+        # Without MPI, can still farm redshifts out to a pool of
+        # (forked) processes on this machine.
+        ncores = self.pf['hps_ncores']
+        if (size == 1) and (ncores is not None) and (ncores > 1) and todo:
+            global _tabulate_ps_instance
+            _tabulate_ps_instance = self
+            # Pool is terminated on the way out, even if a worker raises,
+            # and we don't hang on to a reference to this model.
+            try:
+                with multiprocessing.get_context('fork').Pool(ncores) as pool:
+                    _collect(pool.imap(_tabulate_ps_one_z,
+                        [(z, ftkwargs) for i, z in todo]))
+            finally:
+                _tabulate_ps_instance = None
+        else:
+            _collect(self._tabulate_ps_one_z(z, **ftkwargs) \
+                for i, z in todo)
 
         pb.finish()
 
@@ -1015,21 +1207,37 @@ class HaloModel(HaloMassFunction):
 
 
         # Collect results!
+        # (reduce in place, so we don't need a second copy of each table)
         if size > 1:
-            tmp1 = np.zeros_like(tab_ps_mm)
-            nothing = MPI.COMM_WORLD.Allreduce(tab_ps_mm, tmp1)
-            self.tab_ps_mm = tmp1
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, tab_ps_mm, op=MPI.SUM)
+            MPI.COMM_WORLD.Allreduce(MPI.IN_PLACE, tab_cf_mm, op=MPI.SUM)
 
-            tmp2 = np.zeros_like(tab_cf_mm)
-            nothing = MPI.COMM_WORLD.Allreduce(tab_cf_mm, tmp2)
-            self.tab_cf_mm = tmp2
-
-        else:
-            self.tab_ps_mm = tab_ps_mm
-            self.tab_cf_mm = tab_cf_mm
+        self.tab_ps_mm = tab_ps_mm
+        self.tab_cf_mm = tab_cf_mm
 
         # Done!
 
+    def _tabulate_ps_one_z(self, z, **ftkwargs):
+        """
+        Compute matter power spectrum and correlation function at one
+        redshift, i.e., a single row of tab_ps_mm and tab_cf_mm.
+        """
+
+        ##
+        # Calculate from scratch
+        ##
+        print("Processor {} generating z={} PS and CF...".format(rank, z))
+
+        # Must interpolate back to fine grid (uniformly sampled
+        # real-space scales) to do FFT and obtain correlation function
+        ps = self.get_ps_tot(z, self.tab_k)
+
+        # Compute correlation function at native resolution to save time
+        # later.
+        cf = self.InverseFT3D(self.tab_R, ps, self.tab_k, **ftkwargs)
+
+        return ps, cf
+
     def SavePS(self, fn=None, clobber=True, destination=None, format='hdf5',
         checkpoint=True, **ftkwargs):
         """
@@ -1060,11 +1268,7 @@ class HaloModel(HaloMassFunction):
                 print("Suffix of provided filename does not match chosen format.")
                 print("Will go with format indicated by filename suffix.")
 
-        if os.path.exists(fn):
-            if clobber:
-                os.system('rm -f %s' % fn)
-            else:
-                raise IOError('File %s exists! Set clobber=True or remove manually.' % fn)
+        self._prepare_output(fn, clobber)
 
         # Do this first! (Otherwise parallel runs will be garbage)
         self.TabulatePS(clobber=clobber, checkpoint=checkpoint, **ftkwargs)
@@ -1074,6 +1278,21 @@ class HaloModel(HaloMassFunction):
 
         self._write_ps(fn, clobber, format)
 
+    def _prepare_output(self, fn, clobber):
+        """ Remove pre-existing file `fn` if clobber=True, otherwise complain. """
+
+        if not os.path.exists(fn):
+            return
+
+        if not clobber:
+            raise IOError('File %s exists! Set clobber=True or remove manually.' % fn)
+
+        # Another processor may have beaten us to it.
+        try:
+            os.unlink(fn)
+        except FileNotFoundError:
+            pass
+
     def _write_ps(self, fn, clobber, format=format):
 
         try:
@@ -1082,31 +1301,37 @@ class HaloModel(HaloMassFunction):
         except AttributeError:
             hmf_v = 'unknown'
 
-        if os.path.exists(fn):
-            if clobber:
-                os.system('rm -f %s' % fn)
-            else:
-                raise IOError('File %s exists! Set clobber=True or remove manually.' % fn)
+        self._prepare_output(fn, clobber)
+        HaloModel._forget_ps_tables(fn)
 
         if format == 'hdf5':
             f = h5py.File(fn, 'w')
             f.create_dataset('tab_z_ps', data=self.tab_z_ps)
             f.create_dataset('tab_R', data=self.tab_R)
             f.create_dataset('tab_k', data=self.tab_k)
-            f.create_dataset('tab_ps_mm', data=self.tab_ps_mm)
-            f.create_dataset('tab_cf_mm', data=self.tab_cf_mm)
+
+            # Big tables: chunk by redshift and compress (smooth, so they
+            # compress well), which also makes single-z reads cheap.
+            f.create_dataset('tab_ps_mm', data=self.tab_ps_mm,
+                chunks=(1, self.tab_k.size), compression='gzip',
+                compression_opts=4, shuffle=True)
+            f.create_dataset('tab_cf_mm', data=self.tab_cf_mm,
+                chunks=(1, self.tab_R.size), compression='gzip',
+                compression_opts=4, shuffle=True)
 
             f.close()
         # Otherwise, pickle it!
         else:
-            f = open(fn, 'wb')
-            pickle.dump(self.tab_z_ps, f)
-            pickle.dump(self.tab_R, f)
-            pickle.dump(self.tab_k, f)
-            pickle.dump(self.tab_ps_mm, f)
-            pickle.dump(self.tab_cf_mm, f)
-            pickle.dump(dict(('hmf-version', hmf_v)))
-            f.close()
+            # Same sequence of objects _load_ps expects, but with the
+            # newest protocol, which handles big numpy arrays efficiently.
+            protocol = pickle.HIGHEST_PROTOCOL
+            with open(fn, 'wb') as f:
+                pickle.dump(self.tab_z_ps, f, protocol)
+                pickle.dump(self.tab_R, f, protocol)
+                pickle.dump(self.tab_k, f, protocol)
+                pickle.dump(self.tab_ps_mm, f, protocol)
+                pickle.dump(self.tab_cf_mm, f, protocol)
+                pickle.dump({'hmf-version': hmf_v}, f, protocol)
 
         print('Wrote %s.' % fn)
         return
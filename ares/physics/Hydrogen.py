@@ -259,7 +259,7 @@ class Hydrogen(object):
         return 1. + xc / (xt * (1. + xt))
 
     def beta_x(self, z, Tk, xHII, ne, Ja):
-        xt = self._xtot(z, Tk, Ja, xHII, ne)
+        xt = self._xtot(z, Tk, xHII, ne, Ja)
 
         term2 = (self._xc_HH(z, Tk, xHII, ne) - self._xc_eH(z, Tk, xHII, ne)) \
             / (xt * (1. + xt))
@@ -271,6 +271,28 @@ class Hydrogen(object):
         xt = self._xtot(z, Tk, xHII, ne, Ja)
         return xa / (xt * (1. + xt))
 
+    def betas(self, z, Tk, xHII, ne, Ja):
+        """
+        Compute beta_x, beta_d, and beta_a all at once, so that the coupling
+        coefficients they share only need to be computed once.
+
+        Returns
+        -------
+        Dictionary with keys 'x', 'd', and 'a'.
+
+        """
+        xc = self._xc(z, Tk, xHII, ne)
+        xa = self._xa(z, Tk, xHII, ne, Ja)
+        xt = xc + xa
+
+        denom = xt * (1. + xt)
+
+        xc_HH = self._xc_HH(z, Tk, xHII, ne)
+        xc_eH = self._xc_eH(z, Tk, xHII, ne)
+
+        return {'x': 1. + (xc_HH - xc_eH) / denom, 'd': 1. + xc / denom,
+            'a': xa / denom}
+
     def beta_T(self, z, Tk, xHII, ne, Ja):
         xt = self._xtot(z, Tk, xHII, ne, Ja)
         xc_HH = self._xc_HH(z, Tk, xHII, ne)
@@ -44,6 +44,10 @@ class GalaxyAggregate(HaloPopulation):
         HaloPopulation.__init__(self, **kwargs)
         #self.pf.update(**kwargs)
 
+        # Looked up on every call to get_emissivity, so bind it once here.
+        self._sed_model = self.pf['pop_sed_model']
+        self._emissivity_factors = {}
+
     @property
     def _sfrd(self):
         if not hasattr(self, '_sfrd_'):
@@ -197,41 +201,67 @@ class GalaxyAggregate(HaloPopulation):
         if not np.any(on):
             return z * on
 
+        # None means (Emin, Emax) lies outside the SED entirely
+        factor = self._get_emissivity_factor(Emin, Emax)
+        if factor is None:
+            return 0.0
+
+        # This assumes we're interested in the (EminNorm, EmaxNorm) band.
+        # (SFRD already applies `on`, no need to do it again here)
+        rhoL = self.SFRD(z) * self.yield_per_sfr * factor
+
+        if (E is not None) and self._sed_model:
+            return rhoL * self.src.Spectrum(E)
+        else:
+            return rhoL
+
+    def _get_emissivity_factor(self, Emin, Emax):
+        """
+        Factor that converts the luminosity density in the reference band
+        to the emissivity in the (Emin, Emax) band, including escape
+        fractions and reprocessing.
+
+        This only depends on the band, so it's cached, keyed by (Emin, Emax).
+        Returns None if the band doesn't overlap the SED at all.
+        """
+
+        if (Emin, Emax) in self._emissivity_factors:
+            return self._emissivity_factors[(Emin, Emax)]
+
         if self.pf['pop_sed_model'] and (Emin is not None) \
           and (Emax is not None):
-            if (Emin > self.pf['pop_Emax']):
-                return 0.0
-            if (Emax < self.pf['pop_Emin']):
-                return 0.0
-
-        # This assumes we're interested in the (EminNorm, EmaxNorm) band
-        rhoL = self.SFRD(z) * self.yield_per_sfr * on
+            if (Emin > self.pf['pop_Emax']) or (Emax < self.pf['pop_Emin']):
+                self._emissivity_factors[(Emin, Emax)] = None
+                return None
 
         ##
         # Models based on photons / baryon
         ##
         if not self.pf['pop_sed_model']:
             if (round(Emin, 1), round(Emax, 1)) == (10.2, 13.6):
-                return rhoL * self.pf['pop_Nlw'] * self.pf['pop_fesc_LW'] \
+                factor = self.pf['pop_Nlw'] * self.pf['pop_fesc_LW'] \
                     * self._get_energy_per_photon(Emin, Emax) * erg_per_ev \
                     / self.cosm.g_per_baryon
             elif round(Emin, 1) == 13.6:
-                return rhoL * self.pf['pop_Nion'] * self.pf['pop_fesc'] \
+                factor = self.pf['pop_Nion'] * self.pf['pop_fesc'] \
                     * self._get_energy_per_photon(Emin, Emax) * erg_per_ev \
                     / self.cosm.g_per_baryon #/ (Emax - Emin)
             else:
-                return rhoL * self.pf['pop_fX'] * self.pf['pop_cX'] \
+                factor = self.pf['pop_fX'] * self.pf['pop_cX'] \
                     / (g_per_msun / s_per_yr)
 
+            self._emissivity_factors[(Emin, Emax)] = factor
+            return factor
+
         # Convert from reference band to arbitrary band
-        rhoL *= self._convert_band(Emin, Emax)
+        factor = self._convert_band(Emin, Emax)
 
         # Apply reprocessing
         if (Emax is None) or (Emin is None):
             if self.pf['pop_reproc']:
-                rhoL *= (1. - self.pf['pop_fesc']) * self.pf['pop_frep']
+                factor *= (1. - self.pf['pop_fesc']) * self.pf['pop_frep']
         elif Emax > E_LL and Emin < self.pf['pop_Emin_xray']:
-            rhoL *= self.pf['pop_fesc']
+            factor *= self.pf['pop_fesc']
         elif Emax <= E_LL:
             if self.pf['pop_reproc']:
                 fesc = (1. - self.pf['pop_fesc']) * self.pf['pop_frep']
@@ -240,12 +270,11 @@ class GalaxyAggregate(HaloPopulation):
             else:
                 fesc = 1.
 
-            rhoL *= fesc
+            factor *= fesc
 
-        if E is not None:
-            return rhoL * self.src.Spectrum(E)
-        else:
-            return rhoL
+        self._emissivity_factors[(Emin, Emax)] = factor
+
+        return factor
 
     def NumberEmissivity(self, z, E=None, Emin=None, Emax=None):
         return self.Emissivity(z, E=E, Emin=Emin, Emax=Emax) / (E * erg_per_ev)
@@ -738,9 +738,9 @@ class Population(object):
         """
 
         if not self.pf['pop_sed_model']:
-            Eavg = np.mean([Emin, Emax])
-            self._eV_per_phot[(Emin, Emax)] = Eavg
-            return Eavg
+            if (Emin, Emax) not in self._eV_per_phot:
+                self._eV_per_phot[(Emin, Emax)] = np.mean([Emin, Emax])
+            return self._eV_per_phot[(Emin, Emax)]
 
         different_band = False
 
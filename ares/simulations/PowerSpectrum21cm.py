@@ -2,7 +2,6 @@ import os
 import copy
 import pickle
 import numpy as np
-from types import FunctionType
 from ..static import Fluctuations
 from .Global21cm import Global21cm
 from ..physics.HaloModel import HaloModel
@@ -117,14 +116,33 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
         pb = self.pb = ProgressBar(N, use=self.pf['progress_bar'],
             name='ps-21cm')
 
-        all_ps = []
+        # Results go straight into the final (z, ...) arrays, which are
+        # allocated once we've seen the first step's output.
+        hist = {}
         for i, (z, data) in enumerate(self.step()):
 
-            # Do stuff
-            all_ps.append(data.copy())
-
             if i == 0:
-                keys = data.keys()
+                for key in data.keys():
+
+                    is2d_k = key.startswith('ps')
+                    is2d_R = key.startswith('jp') or key.startswith('ev') \
+                          or key.startswith('cf')
+                    is2d_B = (key in ['n_i', 'm_i', 'r_i', 'delta_B'])
+
+                    if is2d_k:
+                        hist[key] = np.zeros((len(self.z), len(self.k)))
+                    elif is2d_R:
+                        hist[key] = np.zeros((len(self.z), len(self.R)))
+                    elif is2d_B:
+                        hist[key] = np.zeros((len(self.z), len(data['r_i'])))
+                    else:
+                        hist[key] = np.zeros_like(self.z)
+
+            for key in hist:
+                if key not in data:
+                    continue
+
+                hist[key][i] = data[key]
 
             if not pb.has_pb:
                 pb.start()
@@ -133,33 +151,6 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
 
         pb.finish()
 
-        self.all_ps = all_ps
-
-        hist = {}
-        for key in keys:
-
-            is2d_k = key.startswith('ps')
-            is2d_R = key.startswith('jp') or key.startswith('ev') \
-                  or key.startswith('cf')
-            is2d_B = (key in ['n_i', 'm_i', 'r_i', 'delta_B'])
-
-            if is2d_k:
-                tmp = np.zeros((len(self.z), len(self.k)))
-            elif is2d_R:
-                tmp = np.zeros((len(self.z), len(self.R)))
-            elif is2d_B:
-                tmp = np.zeros((len(self.z), len(all_ps[0]['r_i'])))
-            else:
-                tmp = np.zeros_like(self.z)
-
-            for i, z in enumerate(self.z):
-                if key not in all_ps[i].keys():
-                    continue
-
-                tmp[i] = all_ps[i][key]
-
-            hist[key] = tmp.copy()
-
         self.history = hist
         self.history['z'] = self.z
         self.history['k'] = self.k
@@ -213,9 +204,11 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
     @property
     def tab_Mmin(self):
         if not hasattr(self, '_tab_Mmin'):
-            self._tab_Mmin = np.ones_like(self.halos.tab_z) * np.inf
-            for j, pop in enumerate(self.pops):
-                self._tab_Mmin = np.minimum(self._tab_Mmin, pop._tab_Mmin)
+            if len(self.pops) == 0:
+                self._tab_Mmin = np.ones_like(self.halos.tab_z) * np.inf
+            else:
+                self._tab_Mmin = np.minimum.reduce([pop._tab_Mmin \
+                    for pop in self.pops])
 
         return self._tab_Mmin
 
@@ -231,6 +224,83 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
         # Set a few things before we get moving.
         self.field.tab_Mmin = self.tab_Mmin
 
+        # Interpolate the global quantities we need onto our (coarser)
+        # redshift grid all at once, rather than one redshift at a time.
+        zrev = self.mean_history['z'][-1::-1]
+        tab_Tk = np.interp(self.z, zrev, self.mean_history['igm_Tk'][-1::-1])
+        tab_Ts = np.interp(self.z, zrev, self.mean_history['Ts'][-1::-1])
+        tab_Ja = np.interp(self.z, zrev, self.mean_history['Ja'][-1::-1])
+
+        zrev = self.gs.history['z'][-1::-1]
+        tab_Qi_gs = np.interp(self.z, zrev,
+            self.gs.history['cgm_h_2'][-1::-1])
+        tab_dTb = np.interp(self.z, zrev, self.gs.history['dTb'][-1::-1])
+        tab_xavg = np.interp(self.z, zrev, self.gs.history['xavg'][-1::-1])
+
+        ##
+        # Figure out scaling from ionized regions to heated regions.
+        # Right now, only constant (relative) scaling is allowed.
+        # (only depends on parameters, so do it once, not every step)
+        ##
+        asize = self.pf['bubble_shell_asize_zone_0']
+        if self.pf['ps_include_temp'] and asize is not None:
+
+            self.field.is_Rs_const = False
+
+            if callable(asize):
+                R_s = lambda R, z: R + asize(z)
+            else:
+                R_s = lambda R, z: R + asize
+
+        elif self.pf['ps_include_temp'] and self.pf['ps_include_ion']:
+            fvol = self.pf["bubble_shell_rvol_zone_0"]
+            frad = self.pf['bubble_shell_rsize_zone_0']
+
+            assert (fvol is not None) + (frad is not None) <= 1
+
+            if fvol is not None:
+                assert frad is None
+
+                # Assume independent variable is redshift for now.
+                if callable(fvol):
+                    frad = lambda z: (1. + fvol(z))**(1./3.) - 1.
+                    self.field.is_Rs_const = False
+                else:
+                    frad = lambda z: (1. + fvol)**(1./3.) - 1.
+
+            elif frad is not None:
+                if callable(frad):
+                    self.field.is_Rs_const = False
+                else:
+                    _frad = frad
+                    frad = lambda z: _frad
+            else:
+                # If R_s = R_s(z), must re-compute overlap volumes on each
+                # step. Should set attribute if this is the case.
+                raise NotImplemented('help')
+
+            R_s = lambda R, z: R * (1. + frad(z))
+
+
+        else:
+            R_s = lambda R, z: None
+            Th = None
+
+        # Must be constant, for now.
+        Th = self.pf["bubble_shell_ktemp_zone_0"]
+
+        self.R_s = R_s
+        self.Th = Th
+
+        # These are fixed for the whole calculation, so look them up once.
+        include_ion = self.pf['ps_include_ion']
+        include_temp = self.pf['ps_include_temp']
+        include_21cm = self.pf['ps_include_21cm']
+        output_components = self.pf['ps_output_components']
+        ftkwargs = {'split_by_scale': self.pf['ps_split_transform'],
+            'epsrel': self.pf['ps_fht_rtol'], 'epsabs': self.pf['ps_fht_atol'],
+            'method': self.pf['ps_fht_method']}
+
         for i, z in enumerate(self.z):
 
             data = {}
@@ -243,19 +313,23 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
             # Prepare for the general case of Mh-dependent things
             Nion = np.zeros_like(self.halos.tab_M)
             Nlya = np.zeros_like(self.halos.tab_M)
-            fXcX = np.zeros_like(self.halos.tab_M)
-            zeta_ion = zeta = np.zeros_like(self.halos.tab_M)
+            zeta = np.zeros_like(self.halos.tab_M)
             zeta_lya = np.zeros_like(self.halos.tab_M)
             zeta_X = np.zeros_like(self.halos.tab_M)
             #Tpro = None
             for j, pop in enumerate(self.pops):
-                pop_zeta = pop.get_zeta(z=z)
 
                 if pop.is_src_ion:
+                    # Only needed for ionizing sources.
+                    pop_zeta = pop.get_zeta(z=z)
 
                     if type(pop_zeta) is tuple:
                         _Mh, _zeta = pop_zeta
-                        zeta += np.interp(self.halos.tab_M, _Mh, _zeta)
+                        # Usually already on our mass grid.
+                        if _Mh is self.halos.tab_M:
+                            zeta += _zeta
+                        else:
+                            zeta += np.interp(self.halos.tab_M, _Mh, _zeta)
                         Nion += pop.src.Nion
                     else:
                         zeta += pop_zeta
@@ -278,11 +352,11 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
             ##
             # Make scalar if it's a simple model
             ##
-            if np.all(np.diff(zeta) == 0):
+            if zeta.max() == zeta.min():
                 zeta = zeta[0]
-            if np.all(np.diff(zeta_X) == 0):
+            if zeta_X.max() == zeta_X.min():
                 zeta_X = zeta_X[0]
-            if np.all(np.diff(zeta_lya) == 0):
+            if zeta_lya.max() == zeta_lya.min():
                 zeta_lya = zeta_lya[0]
 
             self.field.zeta = zeta
@@ -290,70 +364,13 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
 
             self.zeta = zeta
 
-            ##
-            # Figure out scaling from ionized regions to heated regions.
-            # Right now, only constant (relative) scaling is allowed.
-            ##
-            asize = self.pf['bubble_shell_asize_zone_0']
-            if self.pf['ps_include_temp'] and asize is not None:
-
-                self.field.is_Rs_const = False
-
-                if type(asize) is FunctionType:
-                    R_s = lambda R, z: R + asize(z)
-                else:
-                    R_s = lambda R, z: R + asize
-
-            elif self.pf['ps_include_temp'] and self.pf['ps_include_ion']:
-                fvol = self.pf["bubble_shell_rvol_zone_0"]
-                frad = self.pf['bubble_shell_rsize_zone_0']
-
-                assert (fvol is not None) + (frad is not None) <= 1
-
-                if fvol is not None:
-                    assert frad is None
-
-                    # Assume independent variable is redshift for now.
-                    if type(fvol) is FunctionType:
-                        frad = lambda z: (1. + fvol(z))**(1./3.) - 1.
-                        self.field.is_Rs_const = False
-                    else:
-                        frad = lambda z: (1. + fvol)**(1./3.) - 1.
-
-                elif frad is not None:
-                    if type(frad) is FunctionType:
-                        self.field.is_Rs_const = False
-                    else:
-                        frad = lambda z: frad
-                else:
-                    # If R_s = R_s(z), must re-compute overlap volumes on each
-                    # step. Should set attribute if this is the case.
-                    raise NotImplemented('help')
-
-                R_s = lambda R, z: R * (1. + frad(z))
-
-
-            else:
-                R_s = lambda R, z: None
-                Th = None
-
-            # Must be constant, for now.
-            Th = self.pf["bubble_shell_ktemp_zone_0"]
-
-            self.R_s = R_s
-            self.Th = Th
-
-
             ##
             # First: some global quantities we'll need
             ##
             Tcmb = self.cosm.TCMB(z)
-            Tk = np.interp(z, self.mean_history['z'][-1::-1],
-                self.mean_history['igm_Tk'][-1::-1])
-            Ts = np.interp(z, self.mean_history['z'][-1::-1],
-                self.mean_history['Ts'][-1::-1])
-            Ja = np.interp(z, self.mean_history['z'][-1::-1],
-                self.mean_history['Ja'][-1::-1])
+            Tk = tab_Tk[i]
+            Ts = tab_Ts[i]
+            Ja = tab_Ja[i]
             xHII, ne = [0] * 2
 
             xa = self.hydr.RadiativeCouplingCoefficient(z, Ja, Tk)
@@ -376,15 +393,14 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
 
 
             # Add beta factors to dictionary
+            betas = self.hydr.betas(z, Tk, xHII, ne, Ja)
             for f1 in ['x', 'd', 'a']:
-                func = self.hydr.__getattribute__('beta_%s' % f1)
-                data['beta_%s' % f1] = func(z, Tk, xHII, ne, Ja)
+                data['beta_%s' % f1] = betas[f1]
 
-            Qi_gs = np.interp(z, self.gs.history['z'][-1::-1],
-                self.gs.history['cgm_h_2'][-1::-1])
+            Qi_gs = tab_Qi_gs[i]
 
             # Ionization fluctuations
-            if self.pf['ps_include_ion']:
+            if include_ion:
 
                 Ri, Mi, Ni = self.field.BubbleSizeDistribution(z, ion=True)
 
@@ -403,19 +419,16 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
 
             #print(z, Qi_bff, Qi, xibar, Qi_bff / Qi)
 
-            if self.pf['ps_include_temp']:
+            if include_temp:
                 # R_s=R_s(Ri,z)
                 Qh = self.field.MeanIonizedFraction(z, ion=False)
                 data['Qh'] = Qh
             else:
                 data['Qh'] = Qh = 0.0
 
-            # Interpolate global signal onto new (coarser) redshift grid.
-            dTb_ps = np.interp(z, self.gs.history['z'][-1::-1],
-                self.gs.history['dTb'][-1::-1])
-
-            xavg_gs = np.interp(z, self.gs.history['z'][-1::-1],
-                self.gs.history['xavg'][-1::-1])
+            # Global signal on new (coarser) redshift grid.
+            dTb_ps = tab_dTb[i]
+            xavg_gs = tab_xavg[i]
 
             data['dTb'] = dTb_ps
 
@@ -427,17 +440,12 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
             # Correct for fraction of ionized and heated volumes
             # and densities!
             ##
-            if self.pf['ps_include_temp']:
+            if include_temp:
                 data['dTb_vcorr'] = None#(1 - Qh - Qi) * data['dTb_bulk'] \
                     #+ Qh * self.hydr.dTb(z, 0.0, Th)
             else:
                 data['dTb_vcorr'] = None#data['dTb_bulk'] * (1. - Qi)
 
-            if self.pf['ps_include_xcorr_ion_rho']:
-                pass
-            if self.pf['ps_include_xcorr_ion_hot']:
-                pass
-
             # Just for now
             data['dTb0'] = data['dTb']
             data['dTb0_2'] = data['dTb0_1'] = data['dTb_vcorr']
@@ -484,7 +492,7 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
             ##
             # 21-cm fluctuations
             ##
-            if self.pf['ps_include_21cm']:
+            if include_21cm:
 
                 data['cf_21'] = self.field.CorrelationFunction(z,
                     R=self.R, term='21', R_s=R_s(Ri,z), Ts=Ts, Th=Th,
@@ -493,10 +501,7 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
                 # Always compute the 21-cm power spectrum. Individual power
                 # spectra can be saved by setting ps_save_components=True.
                 data['ps_21'] = self.field.PowerSpectrumFromCF(self.k,
-                    data['cf_21'], self.R,
-                    split_by_scale=self.pf['ps_split_transform'],
-                    epsrel=self.pf['ps_fht_rtol'],
-                    epsabs=self.pf['ps_fht_atol'])
+                    data['cf_21'], self.R, **ftkwargs)
 
             # Should just do the above, and then loop over whatever is in
             # the cache and save also. If ps_save_components is True, then
@@ -515,15 +520,12 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
 
                 data['cf_{}'.format(term)] = _cf.copy()
 
-                if not self.pf['ps_output_components']:
+                if not output_components:
                     continue
 
                 data['ps_{}'.format(term)] = \
                     self.field.PowerSpectrumFromCF(self.k,
-                    data['cf_{}'.format(term)], self.R,
-                    split_by_scale=self.pf['ps_split_transform'],
-                    epsrel=self.pf['ps_fht_rtol'],
-                    epsabs=self.pf['ps_fht_atol'])
+                    data['cf_{}'.format(term)], self.R, **ftkwargs)
 
             # Always save the matter correlation function.
             data['cf_dd'] = self.field.CorrelationFunction(z,
@@ -563,13 +565,13 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
                 raise IOError('%s exists! Set clobber=True to overwrite.' % fn)
 
         if suffix == 'pkl':
-            f = open(fn, 'wb')
-            pickle.dump(self.history._data, f)
-            f.close()
+            # Newest protocol handles the big numpy arrays most efficiently
+            with open(fn, 'wb') as f:
+                pickle.dump(self.history, f, pickle.HIGHEST_PROTOCOL)
 
             try:
                 f = open('%s.blobs.%s' % (prefix, suffix), 'wb')
-                pickle.dump(self.blobs, f)
+                pickle.dump(self.blobs, f, pickle.HIGHEST_PROTOCOL)
                 f.close()
 
                 if self.pf['verbose']:
@@ -585,39 +587,45 @@ class PowerSpectrum21cm(AnalyzePS): # pragma: no cover
                 if fields is not None:
                     if key not in fields:
                         continue
-                f.create_dataset(key, data=np.array(self.history[key]))
+
+                arr = np.asarray(self.history[key])
+
+                # 2-D (z, k or R) outputs: one chunk per redshift, compressed
+                if arr.ndim == 2 and arr.size > 0:
+                    f.create_dataset(key, data=arr, chunks=(1, arr.shape[1]),
+                        compression='gzip', compression_opts=4, shuffle=True)
+                else:
+                    f.create_dataset(key, data=arr)
             f.close()
 
-        # ASCII format
+        # ASCII format. Only quantities with one value per redshift fit.
         else:
-            f = open(fn, 'w')
-            print >> f, "#",
-
+            keys = []
+            skipped = []
             for key in self.history:
                 if fields is not None:
                     if key not in fields:
                         continue
-                print >> f, '%-18s' % key,
 
-            print >> f, ''
-
-            # Now, the data
-            for i in range(len(self.history[key])):
-                s = ''
+                if np.shape(self.history[key]) != self.z.shape:
+                    skipped.append(key)
+                    continue
 
-                for key in self.history:
-                    if fields is not None:
-                        if key not in fields:
-                            continue
+                keys.append(key)
 
-                    s += '%-20.8e' % (self.history[key][i])
+            if skipped:
+                print("WARNING: Not writing {} to {} (need one value per redshift).".format(
+                    ', '.join(skipped), fn))
 
-                if not s.strip():
-                    continue
+            if not keys:
+                print("WARNING: No fields to write to {}!".format(fn))
+                return
 
-                print >> f, s
+            data = np.column_stack([self.history[key] for key in keys])
+            hdr = ''.join(['{0:<18s}'.format(key) for key in keys])
 
-            f.close()
+            np.savetxt(fn, data, fmt='%-20.8e', delimiter='', header=hdr,
+                comments='#')
 
         if self.pf['verbose']:
             print('Wrote {}.fluctuations.{}'.format(prefix, suffix))
@@ -15,7 +15,6 @@ from ..util import ProgressBar
 from .GasParcel import GasParcel
 from ..solvers import RadialField
 from ..util.PrintInfo import print_1d_sim
-from ..util.ReadData import _sort_history
 from ..analysis.RaySegment import RaySegment as AnalyzeRay
 
 class RaySegment(AnalyzeRay):
@@ -100,7 +99,8 @@ class RaySegment(AnalyzeRay):
         pb.start()
 
         all_t = []
-        all_data = []
+        hist = {}
+        nbuf = 0
         for t, dt, data in self.step():
 
             # Compute ionization / heating rate coefficient
@@ -109,9 +109,23 @@ class RaySegment(AnalyzeRay):
             # Re-compute rate coefficients
             self.update_rate_coefficients(data, **RCs)
 
-            # Save data
+            # Save data. History is stored as one (time, cell) array per
+            # field, which we grow (by doubling) as we go.
+            i = len(all_t)
+            if i == 0:
+                nbuf = 128
+                for key in data:
+                    hist[key] = np.zeros((nbuf,) + np.shape(data[key]))
+            elif i == nbuf:
+                nbuf *= 2
+                for key in hist:
+                    hist[key] = np.concatenate([hist[key],
+                        np.zeros_like(hist[key])])
+
+            for key in hist:
+                hist[key][i] = data[key]
+
             all_t.append(t)
-            all_data.append(data.copy())
 
             if t >= tf:
                 break
@@ -120,7 +134,7 @@ class RaySegment(AnalyzeRay):
 
         pb.finish()
 
-        to_return = _sort_history(all_data)
+        to_return = {key: hist[key][0:len(all_t)].copy() for key in hist}
         to_return['t'] = np.array(all_t)
 
         self.history = to_return
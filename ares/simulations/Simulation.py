@@ -2,7 +2,6 @@ import os
 import copy
 import pickle
 import numpy as np
-from types import FunctionType
 from ..static import Fluctuations
 from .Global21cm import Global21cm
 from ..physics.HaloModel import HaloModel
@@ -439,9 +438,11 @@ class Simulation(AnalyzePS): # pragma: no cover
     @property
     def tab_Mmin(self):
         if not hasattr(self, '_tab_Mmin'):
-            self._tab_Mmin = np.ones_like(self.halos.tab_z) * np.inf
-            for j, pop in enumerate(self.pops):
-                self._tab_Mmin = np.minimum(self._tab_Mmin, pop._tab_Mmin)
+            if len(self.pops) == 0:
+                self._tab_Mmin = np.ones_like(self.halos.tab_z) * np.inf
+            else:
+                self._tab_Mmin = np.minimum.reduce([pop._tab_Mmin \
+                    for pop in self.pops])
 
         return self._tab_Mmin
 
@@ -509,11 +510,11 @@ class Simulation(AnalyzePS): # pragma: no cover
             ##
             # Make scalar if it's a simple model
             ##
-            if np.all(np.diff(zeta) == 0):
+            if zeta.max() == zeta.min():
                 zeta = zeta[0]
-            if np.all(np.diff(zeta_X) == 0):
+            if zeta_X.max() == zeta_X.min():
                 zeta_X = zeta_X[0]
-            if np.all(np.diff(zeta_lya) == 0):
+            if zeta_lya.max() == zeta_lya.min():
                 zeta_lya = zeta_lya[0]
 
             self.field.zeta = zeta
@@ -530,7 +531,7 @@ class Simulation(AnalyzePS): # pragma: no cover
 
                 self.field.is_Rs_const = False
 
-                if type(asize) is FunctionType:
+                if callable(asize):
                     R_s = lambda R, z: R + asize(z)
                 else:
                     R_s = lambda R, z: R + asize
@@ -545,17 +546,18 @@ class Simulation(AnalyzePS): # pragma: no cover
                     assert frad is None
 
                     # Assume independent variable is redshift for now.
-                    if type(fvol) is FunctionType:
+                    if callable(fvol):
                         frad = lambda z: (1. + fvol(z))**(1./3.) - 1.
                         self.field.is_Rs_const = False
                     else:
                         frad = lambda z: (1. + fvol)**(1./3.) - 1.
 
                 elif frad is not None:
-                    if type(frad) is FunctionType:
+                    if callable(frad):
                         self.field.is_Rs_const = False
                     else:
-                        frad = lambda z: frad
+                        _frad = frad
+                        frad = lambda z: _frad
                 else:
                     # If R_s = R_s(z), must re-compute overlap volumes on each
                     # step. Should set attribute if this is the case.
@@ -606,9 +608,9 @@ class Simulation(AnalyzePS): # pragma: no cover
 
 
             # Add beta factors to dictionary
+            betas = self.hydr.betas(z, Tk, xHII, ne, Ja)
             for f1 in ['x', 'd', 'a']:
-                func = self.hydr.__getattribute__('beta_%s' % f1)
-                data['beta_%s' % f1] = func(z, Tk, xHII, ne, Ja)
+                data['beta_%s' % f1] = betas[f1]
 
             Qi_gs = np.interp(z, self.gs.history['z'][-1::-1],
                 self.gs.history['cgm_h_2'][-1::-1])
@@ -733,7 +735,8 @@ class Simulation(AnalyzePS): # pragma: no cover
                     data['cf_21'], self.tab_R,
                     split_by_scale=self.pf['ps_split_transform'],
                     epsrel=self.pf['ps_fht_rtol'],
-                    epsabs=self.pf['ps_fht_atol'])
+                    epsabs=self.pf['ps_fht_atol'],
+                    method=self.pf['ps_fht_method'])
 
             # Should just do the above, and then loop over whatever is in
             # the cache and save also. If ps_save_components is True, then
@@ -760,7 +763,8 @@ class Simulation(AnalyzePS): # pragma: no cover
                     data['cf_{}'.format(term)], self.tab_R,
                     split_by_scale=self.pf['ps_split_transform'],
                     epsrel=self.pf['ps_fht_rtol'],
-                    epsabs=self.pf['ps_fht_atol'])
+                    epsabs=self.pf['ps_fht_atol'],
+                    method=self.pf['ps_fht_method'])
 
             # Always save the matter correlation function.
             data['cf_dd'] = self.field.CorrelationFunction(z,
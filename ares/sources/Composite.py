@@ -17,6 +17,16 @@ from .Star import Star
 from .BlackHole import BlackHole
 from .SynthesisModel import SynthesisModel
 
+# Only difference between clusters and galaxies is galaxies can have SFHs
+_source_classes = \
+{
+ 'star': Star,
+ 'bh': BlackHole,
+ 'toy': Toy,
+ 'cluster': SynthesisModel,
+ 'galaxy': SynthesisModel,
+}
+
 class Composite(object):
     """ Class for stitching together several radiation sources. """
     def __init__(self, grid=None, **kwargs):
@@ -45,24 +55,19 @@ class Composite(object):
         sources = []
         for i in range(self.Ns):
 
-            sf = self.pf.copy()
+            # Sources receive **sf, i.e., their own kwargs dict, so there's
+            # no need to copy the parameter file for each one.
+            sf = self.pf
                                                 
             # Look for {0}, {1}, etc. here
                                                                         
             # Create RadiationSource class instance
-            if sf['source_type'][i] == 'star':
-                rs = Star(**sf)
-            elif sf['source_type'][i] == 'bh':
-                rs = BlackHole(**sf)
-            elif sf['source_type'][i] == 'toy':
-                rs = Toy(**sf)
-            elif sf['source_type'][i] in ['cluster', 'galaxy']:
-                # Only difference is galaxies can have SFHs
-                rs = SynthesisModel(**sf)
-            else:
-                msg = 'Unrecognized source_type: {!s}'.format(\
-                    sf['source_type'][i])
+            src_type = sf['source_type'][i]
+            if src_type not in _source_classes:
+                msg = 'Unrecognized source_type: {!s}'.format(src_type)
                 raise ValueError(msg)
+
+            rs = _source_classes[src_type](**sf)
             
             rs.grid = self.grid
             
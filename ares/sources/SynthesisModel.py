@@ -13,16 +13,19 @@ Description:
 import numpy as np
 from ..data import ARES
 from .Source import Source
-from ..util.Math import interp1d
+from ..util.Math import interp1d, nearest_index
 from ares.physics import Cosmology
 from scipy.optimize import minimize
-from scipy.integrate import cumtrapz
+from scipy.integrate import trapezoid, cumulative_trapezoid
 from ..util.ReadData import read_lit
 from ..physics import NebularEmission
 from ..util.ParameterFile import ParameterFile
 from ares.physics.Constants import h_p, c, erg_per_ev, g_per_msun, s_per_yr, \
     s_per_myr, m_H, ev_per_hz, E_LL
 
+# Photon energy [eV] times wavelength [cm]
+_hc_ev_cm = h_p * c / erg_per_ev
+
 class SynthesisModelBase(Source):
     @property
     def _nebula(self):
@@ -34,42 +37,53 @@ class SynthesisModelBase(Source):
     @property
     def _neb_cont(self):
         if not hasattr(self, '_neb_cont_'):
-            self._neb_cont_ = np.zeros_like(self._data)
-            if self.pf['source_nebular'] > 1 and \
-                self.pf['source_nebular_continuum']:
-
-                for i, t in enumerate(self.times):
-                    if self.pf['source_tneb'] is not None:
-                        j = np.argmin(np.abs(self.pf['source_tneb'] - self.times))
-                    else:
-                        j = i
+            # Scalar zero if turned off, so we don't allocate (and then add)
+            # a full SED-sized array of zeros.
+            if not (self.pf['source_nebular'] > 1 and \
+                self.pf['source_nebular_continuum']):
+                self._neb_cont_ = 0.0
+            else:
+                self._neb_cont_ = np.zeros_like(self._data)
 
-                    spec = self._data_raw[:,j] * self.dwdn
+                # NebularEmission only operates on one spectrum at a time,
+                # but if source_tneb is set every column is the same.
+                spec = self._data_raw * self.dwdn[:,None]
 
-                    # If is_ssp = False, should do cumulative integral
-                    # over time here.
+                # If is_ssp = False, should do cumulative integral
+                # over time here.
 
-                    self._neb_cont_[:,i] = \
-                        self._nebula.Continuum(spec) / self.dwdn
+                if self.pf['source_tneb'] is not None:
+                    j = nearest_index(self.times, self.pf['source_tneb'])
+                    self._neb_cont_[:,:] = \
+                        (self._nebula.Continuum(spec[:,j]) / self.dwdn)[:,None]
+                else:
+                    for i, t in enumerate(self.times):
+                        self._neb_cont_[:,i] = \
+                            self._nebula.Continuum(spec[:,i]) / self.dwdn
 
         return self._neb_cont_
 
     @property
     def _neb_line(self):
         if not hasattr(self, '_neb_line_'):
-            self._neb_line_ = np.zeros_like(self._data)
-            if self.pf['source_nebular'] > 1 and \
-                self.pf['source_nebular_lines']:
-                for i, t in enumerate(self.times):
-                    if self.pf['source_tneb'] is not None:
-                        j = np.argmin(np.abs(self.pf['source_tneb'] - self.times))
-                    else:
-                        j = i
+            # Scalar zero if turned off, so we don't allocate (and then add)
+            # a full SED-sized array of zeros.
+            if not (self.pf['source_nebular'] > 1 and \
+                self.pf['source_nebular_lines']):
+                self._neb_line_ = 0.0
+            else:
+                self._neb_line_ = np.zeros_like(self._data)
 
-                    spec = self._data_raw[:,j] * self.dwdn
+                spec = self._data_raw * self.dwdn[:,None]
 
-                    self._neb_line_[:,i] = \
-                        self._nebula.LineEmission(spec) / self.dwdn
+                if self.pf['source_tneb'] is not None:
+                    j = nearest_index(self.times, self.pf['source_tneb'])
+                    self._neb_line_[:,:] = \
+                        (self._nebula.LineEmission(spec[:,j]) / self.dwdn)[:,None]
+                else:
+                    for i, t in enumerate(self.times):
+                        self._neb_line_[:,i] = \
+                            self._nebula.LineEmission(spec[:,i]) / self.dwdn
 
         return self._neb_line_
 
@@ -82,12 +96,14 @@ class SynthesisModelBase(Source):
         added_neb_line = 0
         null_ionizing_spec = 0
         if not hasattr(self, '_neb_cont_'):
-            self._data += self._neb_cont
+            if isinstance(self._neb_cont, np.ndarray):
+                self._data += self._neb_cont
             added_neb_cont = 1
 
         # Same for nebular lines.
         if not hasattr(self, '_neb_line_'):
-            self._data += self._neb_line
+            if isinstance(self._neb_line, np.ndarray):
+                self._data += self._neb_line
             added_neb_line = 1
 
         if added_neb_cont or added_neb_line:
@@ -96,33 +112,42 @@ class SynthesisModelBase(Source):
         if null_ionizing_spec:
             self._data[self.energies > E_LL] *= self.pf['source_fesc']
 
+    def _ensure_nebular(self):
+        """
+        Make sure the raw (pre-nebular) spectrum, self._data_raw, exists.
+
+        Loading self.data adds nebular emission, saving the raw SED first.
+        """
+        if not hasattr(self, '_data_raw'):
+            self.data
+
     def AveragePhotonEnergy(self, Emin, Emax):
         """
         Return average photon energy in supplied band.
         """
 
-        j1 = np.argmin(np.abs(Emin - self.energies))
-        j2 = np.argmin(np.abs(Emax - self.energies))
+        j1 = nearest_index(self.energies, Emin)
+        j2 = nearest_index(self.energies, Emax)
 
-        E = self.energies[j2:j1][-1::-1]
+        # Energy axis is descending, so flip indices onto ascending copy
+        N = self.Nfreq
+        E = self._energies_asc[N-j1:N-j2]
 
         # Units: erg / s / Hz
         to_int = self.Spectrum(E)
 
         # Units: erg / s
-        return np.trapz(to_int * E, x=E) / np.trapz(to_int, x=E)
+        return trapezoid(to_int * E, x=E) / trapezoid(to_int, x=E)
 
     def _cache_spec(self, E):
         if not hasattr(self, '_cache_spec_'):
             self._cache_spec_ = {}
 
-        if type(E) == np.ndarray:
-            pass
-        else:
-            if E in self._cache_spec_:
-                return self._cache_spec_[E]
+        # Only scalar energies are cached
+        if isinstance(E, (np.ndarray, list)):
+            return None
 
-        return None
+        return self._cache_spec_.get(E)
 
     def Spectrum(self, E):
         """
@@ -133,35 +158,33 @@ class SynthesisModelBase(Source):
         if cached_result is not None:
             return cached_result
 
-        # reverse energies so they are in ascending order
-        nrg = self.energies[-1::-1]
-
-        spec = np.interp(E, nrg, self.sed_at_tsf[-1::-1]) / self.norm
+        spec = np.interp(E, self._energies_asc, self._sed_at_tsf_asc) \
+            / self.norm
 
-        if type(E) != np.ndarray:
+        if not isinstance(E, (np.ndarray, list)):
             self._cache_spec_[E] = spec
 
         return spec
 
     def get_sed_at_t(self, t=None, i_tsf=None, raw=False, nebular_only=False):
         if i_tsf is None:
-            i_tsf = np.argmin(np.abs(t - self.times))
+            i_tsf = nearest_index(self.times, t)
 
+        # Only need one column, so don't copy the whole table
         if raw and not (nebular_only or self.pf['source_nebular_only']):
-            poke = self.sed_at_tsf
-            data = self._data_raw
+            self._ensure_nebular()
+            data = self._data_raw[:,i_tsf].copy()
         else:
-            data = self.data.copy()
+            data = self.data[:,i_tsf].copy()
 
             if nebular_only or self.pf['source_nebular_only']:
-                poke = self.sed_at_tsf
-                data -= self._data_raw
+                data -= self._data_raw[:,i_tsf]
 
         # erg / s / Hz -> erg / s / eV
         if self.pf['source_rad_yield'] == 'from_sed':
-            sed = data[:,i_tsf] * self.dwdn / ev_per_hz
+            sed = data * self.dwdn / ev_per_hz
         else:
-            sed = data[:,i_tsf]
+            sed = data
 
         return sed
 
@@ -172,6 +195,14 @@ class SynthesisModelBase(Source):
                 raw=False)
         return self._sed_at_tsf
 
+    @property
+    def _sed_at_tsf_asc(self):
+        """ Contiguous copy of sed_at_tsf, ordered by ascending energy. """
+        if not hasattr(self, '_sed_at_tsf_asc_'):
+            self._sed_at_tsf_asc_ = \
+                np.ascontiguousarray(self.sed_at_tsf[-1::-1])
+        return self._sed_at_tsf_asc_
+
     @property
     def sed_at_tsf_raw(self):
         if not hasattr(self, '_sed_at_tsf_raw'):
@@ -214,21 +245,22 @@ class SynthesisModelBase(Source):
             # for SynthesisModels we don't specify luminosities by hand. By
             # using (EminNorm, EmaxNorm), we run the risk of specifying a
             # range not spanned by the model.
-            j1 = np.argmin(np.abs(self.Emin - self.energies))
-            j2 = np.argmin(np.abs(self.Emax - self.energies))
+            j1 = nearest_index(self.energies, self.Emin)
+            j2 = nearest_index(self.energies, self.Emax)
 
             # Remember: energy axis in descending order
             # Note use of sed_at_tsf_raw: need to be careful to normalize
             # to total power before application of fesc.
-            self._norm = np.trapz(self.sed_at_tsf_raw[j2:j1][-1::-1],
-                x=self.energies[j2:j1][-1::-1])
+            N = self.Nfreq
+            self._norm = trapezoid(self.sed_at_tsf_raw[j2:j1][-1::-1],
+                x=self._energies_asc[N-j1:N-j2])
 
         return self._norm
 
     @property
     def i_tsf(self):
         if not hasattr(self, '_i_tsf'):
-            self._i_tsf = np.argmin(np.abs(self.pf['source_tsf'] - self.times))
+            self._i_tsf = nearest_index(self.times, self.pf['source_tsf'])
         return self._i_tsf
 
     @property
@@ -257,12 +289,38 @@ class SynthesisModelBase(Source):
 
         return self._LE
 
+    @property
+    def _wavelengths_cm(self):
+        if not hasattr(self, '_wavelengths_cm_'):
+            self._wavelengths_cm_ = self.wavelengths * 1e-8
+        return self._wavelengths_cm_
+
     @property
     def energies(self):
         if not hasattr(self, '_energies'):
-            self._energies = h_p * c / (self.wavelengths / 1e8) / erg_per_ev
+            self._energies = _hc_ev_cm / self._wavelengths_cm
         return self._energies
 
+    @property
+    def _energies_asc(self):
+        """ Contiguous copy of energies in ascending order. """
+        if not hasattr(self, '_energies_asc_'):
+            self._energies_asc_ = np.ascontiguousarray(self.energies[-1::-1])
+        return self._energies_asc_
+
+    @property
+    def _log_wavelengths(self):
+        if not hasattr(self, '_log_wavelengths_'):
+            self._log_wavelengths_ = np.log(self.wavelengths)
+        return self._log_wavelengths_
+
+    @property
+    def _times_s(self):
+        """ Tabulated times in seconds, i.e., integration grid in time. """
+        if not hasattr(self, '_times_s_'):
+            self._times_s_ = self.times * s_per_myr
+        return self._times_s_
+
     @property
     def Emin(self):
         return np.min(self.energies)
@@ -274,7 +332,7 @@ class SynthesisModelBase(Source):
     @property
     def frequencies(self):
         if not hasattr(self, '_frequencies'):
-            self._frequencies = c / (self.wavelengths / 1e8)
+            self._frequencies = c / self._wavelengths_cm
         return self._frequencies
 
     @property
@@ -300,27 +358,43 @@ class SynthesisModelBase(Source):
         if data is None:
             data = self.data
 
-        ok = np.logical_or(wave1 == self.wavelengths,
-                           wave2 == self.wavelengths)
-
-        arr = self.wavelengths[ok==1]
+        i1 = nearest_index(self.wavelengths, wave1)
+        i2 = nearest_index(self.wavelengths, wave2)
 
-        Lh_l = np.array(data[ok==1,:])
+        if (self.wavelengths[i1] != wave1) or (self.wavelengths[i2] != wave2):
+            raise ValueError('wave1 and wave2 must be tabulated wavelengths!')
 
-        logw = np.log(arr)
-        logL = np.log(Lh_l)
+        logw = self._log_wavelengths[[i1, i2]]
+        logL = np.log(data[[i1, i2],:])
 
-        return (logL[0,:] - logL[-1,:]) / (logw[0,None] - logw[-1,None])
+        return (logL[0,:] - logL[1,:]) / (logw[0] - logw[1])
 
     def LUV_of_t(self):
         return self.L_per_sfr_of_t()
 
-    def _cache_L(self, wave, avg, Z, raw, nebular_only):
+    def _get_cache_key(self, wave, avg, Z, *args):
+        """
+        Build hashable key for luminosity caches.
+
+        Bands, which may arrive as lists or arrays, become tuples of floats,
+        so equivalent queries share a single cache entry.
+        """
+        if isinstance(wave, (list, tuple, np.ndarray)):
+            wave = tuple(float(w) for w in wave)
+        else:
+            wave = float(wave)
+
+        if Z is not None:
+            Z = float(Z)
+
+        return (wave, int(avg), Z) + tuple(args)
+
+    def _cache_L(self, key):
         if not hasattr(self, '_cache_L_'):
             self._cache_L_ = {}
 
-        if (wave, avg, Z, raw, nebular_only) in self._cache_L_:
-            return self._cache_L_[(wave, avg, Z, raw, nebular_only)]
+        if key in self._cache_L_:
+            return self._cache_L_[key]
 
         return None
 
@@ -330,36 +404,37 @@ class SynthesisModelBase(Source):
         UV luminosity per unit SFR.
         """
 
-        cached_result = self._cache_L(wave, avg, Z, raw, nebular_only)
+        key = self._get_cache_key(wave, avg, Z, units, raw, nebular_only)
+        cached_result = self._cache_L(key)
 
+        # Cached results are read-only, so no need to copy.
         if cached_result is not None:
             return cached_result
 
         if type(wave) in [list, tuple, np.ndarray]:
 
-            E1 = h_p * c / (wave[0] * 1e-8) / erg_per_ev
-            E2 = h_p * c / (wave[1] * 1e-8) / erg_per_ev
+            E1 = _hc_ev_cm / (wave[0] * 1e-8)
+            E2 = _hc_ev_cm / (wave[1] * 1e-8)
 
             yield_UV = self.IntegratedEmission(Emin=E2, Emax=E1,
                 energy_units=True, raw=raw, nebular_only=nebular_only)
 
         else:
-            j = np.argmin(np.abs(wave - self.wavelengths))
+            j = nearest_index(self.wavelengths, wave)
 
             if Z is not None:
                 assert not raw, "Fix Z-dep option!"
                 Zvals = np.sort(list(self.metallicities.values()))
-                k = np.argmin(np.abs(Z - Zvals))
+                k = nearest_index(Zvals, Z)
                 raw = self.data # just to be sure it has been read in.
                 data = self._data_all_Z[k,j]
             else:
                 if raw and not (nebular_only or self.pf['source_nebular_only']):
-                    poke = self.sed_at_tsf
+                    self._ensure_nebular()
                     data = self._data_raw[j,:]
                 else:
                     data = self.data[j,:].copy()
                     if nebular_only or self.pf['source_nebular_only']:
-                        poke = self.sed_at_tsf
                         data -= self._data_raw[j,:]
 
             if avg == 1:
@@ -374,8 +449,8 @@ class SynthesisModelBase(Source):
                 avg = int(avg)
                 s = (avg - 1) / 2
 
-                j1 = np.argmin(np.abs(wave - s - self.wavelengths))
-                j2 = np.argmin(np.abs(wave + s - self.wavelengths))
+                j1 = nearest_index(self.wavelengths, wave - s)
+                j2 = nearest_index(self.wavelengths, wave + s)
 
                 if units == 'Hz':
                     yield_UV = np.mean(self.data[j1:j2+1,:] \
@@ -389,16 +464,53 @@ class SynthesisModelBase(Source):
         # else:
         #     erg / sec / Hz / (Msun / yr)
 
-        self._cache_L_[(wave, avg, Z, units, raw, nebular_only)] = yield_UV
+        # The raw and Z-dependent paths hand back rows of the SED tables, so
+        # copy those before locking. Everything else is already a new array.
+        if not yield_UV.flags.owndata:
+            yield_UV = yield_UV.copy()
+
+        yield_UV.setflags(write=False)
+        self._cache_L_[key] = yield_UV
 
         return yield_UV
 
-    def _cache_L_per_sfr(self, wave, avg, Z, raw, nebular_only):
+    def L_per_sfr_of_t_many(self, waves, units='Hz', raw=False,
+        nebular_only=False):
+        """
+        UV luminosity per unit SFR at many wavelengths at once.
+
+        Equivalent to calling L_per_sfr_of_t (with avg=1, Z=None) for each
+        element of `waves`, but grabs all rows of the SED table in one go.
+
+        Returns
+        -------
+        Array of shape (len(waves), len(self.times)).
+
+        """
+
+        j = np.array([nearest_index(self.wavelengths, wave) \
+            for wave in waves], dtype=int)
+
+        if raw and not (nebular_only or self.pf['source_nebular_only']):
+            self._ensure_nebular()
+            data = self._data_raw[j,:]
+        else:
+            data = self.data[j,:]
+            if nebular_only or self.pf['source_nebular_only']:
+                data -= self._data_raw[j,:]
+
+        # Fancy indexing above returns a copy, so OK to modify in place.
+        if units == 'Hz':
+            data *= np.abs(self.dwdn[j])[:,None]
+
+        return data
+
+    def _cache_L_per_sfr(self, key):
         if not hasattr(self, '_cache_L_per_sfr_'):
             self._cache_L_per_sfr_ = {}
 
-        if (wave, avg, Z, raw, nebular_only) in self._cache_L_per_sfr_:
-            return self._cache_L_per_sfr_[(wave, avg, Z, raw, nebular_only)]
+        if key in self._cache_L_per_sfr_:
+            return self._cache_L_per_sfr_[key]
 
         return None
 
@@ -426,25 +538,20 @@ class SynthesisModelBase(Source):
 
         """
 
-        cached = self._cache_L_per_sfr(wave, avg, Z, raw, nebular_only)
+        key = self._get_cache_key(wave, avg, Z, raw, nebular_only)
+        cached = self._cache_L_per_sfr(key)
 
         if cached is not None:
             return cached
 
         yield_UV = self.L_per_sfr_of_t(wave, raw=raw, nebular_only=nebular_only)
 
-        # Interpolate in time to obtain final LUV
-        if self.pf['source_tsf'] in self.times:
-            result = yield_UV[np.argmin(np.abs(self.times - self.pf['source_tsf']))]
-        else:
-            k = np.argmin(np.abs(self.pf['source_tsf'] - self.times))
-            if self.times[k] > self.pf['source_tsf']:
-                k -= 1
-
-            func = interp1d(self.times, yield_UV, kind='linear')
-            result = func(self.pf['source_tsf'])
+        # Interpolate in time to obtain final LUV (exact if source_tsf is
+        # one of the tabulated times)
+        result = np.interp(self.pf['source_tsf'], self.times, yield_UV,
+            left=0.0, right=0.0)
 
-        self._cache_L_per_sfr_[(wave, avg, Z, raw, nebular_only)] = result
+        self._cache_L_per_sfr_[key] = result
 
         return result
 
@@ -453,19 +560,19 @@ class SynthesisModelBase(Source):
 
         if unit == 'A':
             x = self.wavelengths
-            i0 = np.argmin(np.abs(x - l0))
-            i1 = np.argmin(np.abs(x - l1))
+            i0 = nearest_index(x, l0)
+            i1 = nearest_index(x, l1)
         elif unit == 'Hz':
             x = self.frequencies
-            i1 = np.argmin(np.abs(x - l0))
-            i0 = np.argmin(np.abs(x - l1))
+            i1 = nearest_index(x, l0)
+            i0 = nearest_index(x, l1)
 
         # Current units: photons / sec / baryon / Angstrom
 
         # Count up the photons in each spectral bin for all times
         photons_per_b_t = np.zeros_like(self.times)
         for i in range(self.times.size):
-            photons_per_b_t[i] = np.trapz(self.emissivity_per_sfr[i1:i0,i],
+            photons_per_b_t[i] = trapezoid(self.emissivity_per_sfr[i1:i0,i],
                 x=x[i1:i0])
 
         t = self.times * s_per_myr
@@ -478,17 +585,17 @@ class SynthesisModelBase(Source):
         Compute the average energy per photon (in eV) in some band.
         """
 
-        i0 = np.argmin(np.abs(self.energies - Emin))
-        i1 = np.argmin(np.abs(self.energies - Emax))
+        i0 = nearest_index(self.energies, Emin)
+        i1 = nearest_index(self.energies, Emax)
 
         # [self.data] = erg / s / A / [depends]
 
         # Must convert units
-        E_tot = np.trapz(self.data[i1:i0,:].T * self.wavelengths[i1:i0],
-            x=np.log(self.wavelengths[i1:i0]), axis=1)
-        N_tot = np.trapz(self.data[i1:i0,:].T * self.wavelengths[i1:i0] \
-            / self.energies[i1:i0] / erg_per_ev,
-            x=np.log(self.wavelengths[i1:i0]), axis=1)
+        logw = self._log_wavelengths[i1:i0]
+        E_tot = trapezoid(self.data[i1:i0,:].T * self.wavelengths[i1:i0],
+            x=logw, axis=1)
+        N_tot = trapezoid(self.data[i1:i0,:].T * self.wavelengths[i1:i0] \
+            / self.energies[i1:i0] / erg_per_ev, x=logw, axis=1)
 
         if self.pf['source_ssp']:
             return E_tot / N_tot / erg_per_ev
@@ -545,33 +652,32 @@ class SynthesisModelBase(Source):
         if Emax is None:
             Emax = np.max(self.energies)
 
-        i0 = np.argmin(np.abs(self.energies - Emin))
-        i1 = np.argmin(np.abs(self.energies - Emax))
+        i0 = nearest_index(self.energies, Emin)
+        i1 = nearest_index(self.energies, Emax)
 
         if i0 == i1:
             print("Emin={}, Emax={}".format(Emin, Emax))
             raise ValueError('Are EminNorm and EmaxNorm set properly?')
 
+        # Only need the (i1, i0) band, so don't copy the whole table
         if raw and not (nebular_only or self.pf['source_nebular_only']):
-            poke = self.sed_at_tsf
-            data = self._data_raw
+            self._ensure_nebular()
+            data = self._data_raw[i1:i0,:]
         else:
-            data = self.data.copy()
+            data = self.data[i1:i0,:]
 
             if nebular_only or self.pf['source_nebular_only']:
-                poke = self.sed_at_tsf
-                data -= self._data_raw
+                data = data - self._data_raw[i1:i0,:]
 
-        # Count up the photons in each spectral bin for all times
-        flux = np.zeros_like(self.times)
-        for i in range(self.times.size):
-            if energy_units:
-                integrand = data[i1:i0,i] * self.wavelengths[i1:i0]
-            else:
-                integrand = data[i1:i0,i] * self.wavelengths[i1:i0] \
-                    / (self.energies[i1:i0] * erg_per_ev)
+        # Count up the photons in each spectral bin for all times at once
+        waves = self.wavelengths[i1:i0]
+        if energy_units:
+            integrand = data * waves[:,None]
+        else:
+            integrand = data * waves[:,None] \
+                / (self.energies[i1:i0,None] * erg_per_ev)
 
-            flux[i] = np.trapz(integrand, x=np.log(self.wavelengths[i1:i0]))
+        flux = trapezoid(integrand, x=self._log_wavelengths[i1:i0], axis=0)
 
         # Current units:
         # if pop_ssp: photons / sec / Msun
@@ -626,10 +732,10 @@ class SynthesisModelBase(Source):
         if self.pf['source_ssp']:
             photons_per_b_t = photons_per_s_per_msun / self.cosm.b_per_msun
             if return_all_t:
-                return cumtrapz(photons_per_b_t, x=self.times*s_per_myr,
+                return cumulative_trapezoid(photons_per_b_t, x=self._times_s,
                     initial=0.0)
             else:
-                return np.trapz(photons_per_b_t, x=self.times*s_per_myr)
+                return trapezoid(photons_per_b_t, x=self._times_s)
         # Take steady-state result
         else:
             photons_per_b_t = photons_per_s_per_msun * s_per_yr \
@@ -706,7 +812,7 @@ class SynthesisModel(SynthesisModelBase):
             if (self.pf['source_Z'] in Zall_l):
                 if self.pf['source_sed_by_Z'] is not None:
                     _tmp = self.pf['source_sed_by_Z'][1]
-                    self._data = _tmp[np.argmin(np.abs(Zall - self.pf['source_Z']))]
+                    self._data = _tmp[nearest_index(Zall, self.pf['source_Z'])]
                 else:
                     self._wavelengths, self._data, _fn = \
                         self._litinst._load(**self.pf)
@@ -742,12 +848,11 @@ class SynthesisModel(SynthesisModelBase):
                     # problems when nebular emission was on and when
                     # starburst99 was being used (mysterious),
                     # hence the log-linear approach here.
-                    _raw_data = np.zeros_like(to_interp[0])
-                    for i, t in enumerate(self._litinst.times):
-                        inter = interp1d(np.log10(Zall),
-                            to_interp[:,:,i], axis=0,
-                            fill_value=0.0, kind=self.pf['interp_Z'])
-                        _raw_data[:,i] = inter(np.log10(self.pf['source_Z']))
+                    # One interpolant along the Z axis handles all
+                    # (wavelength, time) pairs at once.
+                    inter = interp1d(np.log10(Zall), to_interp, axis=0,
+                        fill_value=0.0, kind=self.pf['interp_Z'])
+                    _raw_data = inter(np.log10(self.pf['source_Z']))
 
                 self._data = _raw_data
 
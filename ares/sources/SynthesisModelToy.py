@@ -16,6 +16,43 @@ from .SynthesisModel import SynthesisModelBase
 from ..util.ParameterFile import ParameterFile
 from ..physics.Constants import c, h_p, erg_per_ev, cm_per_ang, ev_per_hz, E_LL
 
+# Photon energy [eV] times wavelength [Angstrom], and c in Angstrom / s
+_hc_ev_ang = h_p * c / erg_per_ev / cm_per_ang
+_c_ang = c / cm_per_ang
+
+def _toy_spectrum(t, wave, norm, beta, gamma, delta, alpha, t0, trise, lmin):
+    """
+    Toy SPS model (source_toysps_method=0) at time(s) `t` [Myr] and
+    wavelength(s) `wave` [Angstrom].
+
+    `t` and `wave` can be broadcast against each other, e.g., to get the
+    whole (wavelength, time) grid at once.
+    """
+
+    ok = wave >= lmin
+
+    # Everything scales with wavelength relative to 1600 Angstrom
+    x = wave / 1600.
+
+    # Normalization of each wavelength is set by UV slope
+    _norm = norm * x**beta
+
+    # Assume that all wavelengths initially decline as a power-law
+    # with the same index
+    _gamma_ = gamma * x**delta
+    pl_decay = (t / 1.)**_gamma_
+
+    # Assume an exponential decay at some critical (wavelength-dependent)
+    # timescale.
+    _t0 = t0 * x**alpha
+    exp_decay = np.exp(-t / _t0)
+
+    # Put it all together.
+    spec = np.where(ok, _norm * pl_decay * exp_decay, 0.0)
+
+    # Assume log-linear at t < trise.
+    return spec * np.where(t < trise, (t / trise)**1.5, 1.0)
+
 class SynthesisModelToy(SynthesisModelBase):
     def __init__(self, **kwargs):
         SynthesisModelBase.__init__(self, **kwargs)
@@ -24,50 +61,55 @@ class SynthesisModelToy(SynthesisModelBase):
         #self.Emin = self.pf['source_Emin']
         #self.Emax = self.pf['source_Emax']
 
-    @property
-    def energies(self):
-        if not hasattr(self, '_energies'):
-            if (self.pf['source_wavelengths'] is not None) or \
-               (self.pf['source_lmin'] is not None):
-                self._energies = h_p * c / self.wavelengths / cm_per_ang \
-                    / erg_per_ev
-            else:
-                dE = self.pf['source_dE']
-                Emin = self.pf['source_Emin']
-                Emax = self.pf['source_Emax']
+    def _init_grid(self):
+        """
+        Setup wavelength and photon energy grids together.
+
+        Either one is set by the user and the other derived from it, so we
+        do just the one branch and store both at once.
+        """
+        if self.pf['source_wavelengths'] is not None:
+            waves = self.pf['source_wavelengths']
+            nrg = _hc_ev_ang / waves
+        elif self.pf['source_lmin'] is not None:
+            waves = np.arange(self.pf['source_lmin'],
+                self.pf['source_lmax']+self.pf['source_dlam'],
+                self.pf['source_dlam'])
+            nrg = _hc_ev_ang / waves
+        else:
+            dE = self.pf['source_dE']
+            Emin = self.pf['source_Emin']
+            Emax = self.pf['source_Emax']
+
+            nrg = np.arange(Emin, Emax+dE, dE)[-1::-1]
+            waves = _hc_ev_ang / nrg
 
-                self._energies = np.arange(Emin, Emax+dE, dE)[-1::-1]
+        if (waves.max() < 2e3):
+            raise ValueError('Wavelengths all FUV. This is generally not a good idea!')
 
-            # Should be in descending order
-            assert np.all(np.diff(self._energies) < 0)
+        # Wavelengths should be in ascending order, energies descending.
+        assert np.all(np.diff(waves) > 0)
+        assert np.all(np.diff(nrg) < 0)
 
+        self._wavelengths = waves
+        self._energies = nrg
+
+    @property
+    def energies(self):
+        if not hasattr(self, '_energies'):
+            self._init_grid()
         return self._energies
 
     @property
     def wavelengths(self):
         if not hasattr(self, '_wavelengths'):
-            if self.pf['source_wavelengths'] is not None:
-                self._wavelengths = self.pf['source_wavelengths']
-            elif self.pf['source_lmin'] is not None:
-                self._wavelengths = np.arange(self.pf['source_lmin'],
-                    self.pf['source_lmax']+self.pf['source_dlam'],
-                    self.pf['source_dlam'])
-            else:
-                self._wavelengths = h_p * c / self.energies / erg_per_ev \
-                    / cm_per_ang
-
-            if (self._wavelengths.max() < 2e3):
-                raise ValueError('Wavelengths all FUV. This is generally not a good idea!')
-
-            # Should be in ascending order
-            assert np.all(np.diff(self._wavelengths) > 0)
-
+            self._init_grid()
         return self._wavelengths
 
     @property
     def frequencies(self):
         if not hasattr(self, '_frequencies'):
-            self._frequencies = c / self.wavelengths / cm_per_ang
+            self._frequencies = _c_ang / self.wavelengths
         return self._frequencies
 
     @property
@@ -80,24 +122,39 @@ class SynthesisModelToy(SynthesisModelBase):
                 self._times = 10**np.arange(0, 4.1, 0.1)
         return self._times
 
+    def _init_grid_spacing(self):
+        """
+        Compute bin widths and Jacobians (dE, dndE, dwdn) in one go.
+
+        dE and dndE share the same energy differences, so only take them once.
+        """
+        diff_E = np.diff(self.energies)
+
+        tmp = np.abs(diff_E)
+        self._dE = np.concatenate((tmp, [tmp[-1]]))
+
+        tmp = np.abs(np.diff(self.frequencies) / diff_E)
+        self._dndE = np.concatenate((tmp, [tmp[-1]]))
+
+        waves = self.wavelengths
+        self._dwdn = waves * waves / (c * 1e8)
+
     @property
     def dE(self):
         if not hasattr(self, '_dE'):
-            tmp = np.abs(np.diff(self.energies))
-            self._dE = np.concatenate((tmp, [tmp[-1]]))
+            self._init_grid_spacing()
         return self._dE
 
     @property
     def dndE(self):
         if not hasattr(self, '_dndE'):
-            tmp = np.abs(np.diff(self.frequencies) / np.diff(self.energies))
-            self._dndE = np.concatenate((tmp, [tmp[-1]]))
+            self._init_grid_spacing()
         return self._dndE
 
     @property
     def dwdn(self):
         if not hasattr(self, '_dwdn'):
-            self._dwdn =  self.wavelengths**2 / (c * 1e8)
+            self._init_grid_spacing()
         return self._dwdn
 
     @property
@@ -119,46 +176,26 @@ class SynthesisModelToy(SynthesisModelBase):
 
     def _Spectrum(self, t, wave=1600.):
 
-        if self.pf['source_toysps_method'] == 0:
-            beta = self.pf["source_toysps_beta"]
-            _norm = self.pf["source_toysps_norm"]
-            gamma = self.pf["source_toysps_gamma"]
-            delta = self.pf["source_toysps_delta"]
-            alpha = self.pf["source_toysps_alpha"]
-            trise = self.pf['source_toysps_trise']
-            _t0 = self.pf['source_toysps_t0']
-            lmin = self.pf['source_toysps_lmin']
-
-            ok = wave >= lmin
-
-            # Normalization of each wavelength is set by UV slope
-            norm = _norm * (wave / 1600.)**beta
+        method = self.pf['source_toysps_method']
 
-            # Assume that all wavelengths initially decline as a power-law
-            # with the same index
-            _gamma_ = gamma * (wave / 1600.)**delta
-            pl_decay = (t / 1.)**_gamma_
-
-            # Assume an exponential decay at some critical (wavelength-dependent)
-            # timescale.
-            t0 = _t0 * (wave / 1600.)**alpha
-            exp_decay = np.exp(-t / t0)
-
-            # Put it all together.
-            spec = norm * pl_decay * exp_decay
-            spec[ok==0] = 0
-
-            # Assume log-linear at t < trise
-            if t < trise:
-                spec *= (t / trise)**1.5
-        elif type(self.pf['source_toysps_method']) == str:
+        if method == 0:
+            spec = _toy_spectrum(t, wave,
+                norm=self.pf["source_toysps_norm"],
+                beta=self.pf["source_toysps_beta"],
+                gamma=self.pf["source_toysps_gamma"],
+                delta=self.pf["source_toysps_delta"],
+                alpha=self.pf["source_toysps_alpha"],
+                t0=self.pf['source_toysps_t0'],
+                trise=self.pf['source_toysps_trise'],
+                lmin=self.pf['source_toysps_lmin'])
+        elif type(method) == str:
 
             is_on = t < (self._Star.lifetime / 1e6) \
                 or (not self.pf['source_ssp'])
 
             if is_on:
                 # This is normalized to Q in each sub-band.
-                E = h_p * c / (wave * cm_per_ang) / erg_per_ev
+                E = _hc_ev_ang / wave
                 spec = self._Star.Spectrum(E)
                 # Right here, `spec` integrates to unity over relevant bands.
 
@@ -176,26 +213,21 @@ class SynthesisModelToy(SynthesisModelBase):
                     E = np.array([E])
                     spec = np.array([spec])
 
-                if self.pf['source_toysps_method'] == 'schaerer2002':
+                if method == 'schaerer2002':
 
                     # Why isn't this all handled in StarQS?
                     # Caused by new wavelength gridding?
                     bands = self._Star.bands
 
-                    norms = []
-                    for i, nrg in enumerate(E):
-                        if nrg < bands[0][1]:
-                            norms.append(self._Star.norm_[0])
-                        elif bands[1][0] <= nrg < bands[1][1]:
-                            norms.append(self._Star.norm_[1])
-                        elif bands[2][0] <= nrg < bands[2][1]:
-                            norms.append(self._Star.norm_[2])
-                        else:
-                            norms.append(self._Star.norm_[2])
-
-                    norms = np.array(norms)
+                    # Index of band each energy falls in. Anything not in
+                    # the first two bands gets the last band's normalization.
+                    in_b1 = np.logical_and(E >= bands[1][0], E < bands[1][1])
+                    i_band = np.where(E < bands[0][1], 0,
+                        np.where(in_b1, 1, 2))
+
+                    norms = np.asarray(self._Star.norm_)[i_band]
                     spec *= norms
-                elif self.pf['source_toysps_method'] == 'bb':
+                elif method == 'bb':
                     spec *= self._Star.Lbol0
                 else:
                     raise NotImplemented('help')
@@ -216,7 +248,7 @@ class SynthesisModelToy(SynthesisModelBase):
 
         else:
             raise NotImpemented('Do not recognize source_toysps_method={}'.format(
-                self.pf['source_toysps_method']
+                method
             ))
 
         return spec
@@ -227,9 +259,13 @@ class SynthesisModelToy(SynthesisModelBase):
         Units of erg / s / A / Msun
         """
         if not hasattr(self, '_data'):
-            self._data = np.zeros((self.wavelengths.size, self.times.size))
-            for i, t in enumerate(self.times):
-                self._data[:,i] = self._Spectrum(t, wave=self.wavelengths)
+            if self.pf['source_toysps_method'] == 0:
+                self._data = self._Spectrum(self.times[None,:],
+                    wave=self.wavelengths[:,None])
+            else:
+                self._data = np.zeros((self.wavelengths.size, self.times.size))
+                for i, t in enumerate(self.times):
+                    self._data[:,i] = self._Spectrum(t, wave=self.wavelengths)
 
             self._add_nebular_emission()
 
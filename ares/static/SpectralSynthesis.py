@@ -1136,7 +1136,9 @@ class SpectralSynthesis(object):
         #
 
         # Setup interpolant for luminosity as a function of SSP age.
-        Loft[Loft == 0] = tiny_lum
+        # Don't modify Loft in place: it may be a (read-only) cached array.
+        if np.any(Loft == 0):
+            Loft = np.where(Loft == 0, tiny_lum, Loft)
         _func = interp1d(np.log(self.src.times), np.log(Loft),
             kind=self.pf['pop_synth_age_interp'], bounds_error=False,
             fill_value=(Loft[0], Loft[-1]))
@@ -11,6 +11,7 @@ Description:
 """
 
 import numpy as np
+from scipy.special import loggamma
 from ..physics.Constants import nu_0_mhz
 from scipy.interpolate import interp1d as interp1d_scipy
 
@@ -149,6 +150,161 @@ def smooth(y, width, kernel='boxcar'):
 
     return result
 
+def simpson_weights(x):
+    """
+    Compute Simpson's rule weights for integrating over grid `x`.
+
+    The integral of y(x) is then just np.dot(w, y). For an even number of
+    points, the last interval is handled with the trapezoid rule.
+
+    .. note :: Simpson's rule requires `x` to be uniformly spaced. If it
+        isn't, this falls back to trapezoid rule weights. For fewer than
+        two points, all weights are zero (like np.trapz).
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Array of x values
+
+    Returns
+    -------
+    Array of weights, same shape as `x`.
+
+    """
+
+    N = len(x)
+
+    w = np.zeros(N)
+
+    if N < 2:
+        return w
+
+    h = (x[-1] - x[0]) / (N - 1.)
+    dx = np.diff(x)
+
+    # Non-uniform grid or too few points: trapezoid rule
+    if (N < 3) or (not np.allclose(dx, h)):
+        w[0:-1] += 0.5 * dx
+        w[1:] += 0.5 * dx
+        return w
+
+    # Simpson's rule over an even number of intervals
+    n = N if N % 2 == 1 else N - 1
+    w[0:n:2] = 2. * h / 3.
+    w[1:n:2] = 4. * h / 3.
+    w[0] = w[n-1] = h / 3.
+
+    # Trapezoid rule for the leftover interval
+    if n < N:
+        w[-2] += 0.5 * h
+        w[-1] += 0.5 * h
+
+    return w
+
+def nearest_index(x, x0):
+    """
+    Find index of element of `x` closest to `x0`.
+
+    Equivalent to np.argmin(np.abs(x - x0)), including how ties are broken,
+    but uses a binary search rather than scanning the whole array.
+
+    .. note :: Assumes `x` is sorted, in ascending or descending order.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sorted array of values.
+    x0 : int, float
+        Value to look up.
+
+    Returns
+    -------
+    Integer index into `x`.
+
+    """
+
+    N = len(x)
+    desc = x[0] > x[-1]
+
+    # Search in ascending order, map back to original index at the end
+    xa = x[-1::-1] if desc else x
+
+    i = np.searchsorted(xa, x0)
+
+    if i == 0:
+        j = 0
+    elif i == N:
+        j = N - 1
+    else:
+        dl = x0 - xa[i-1]
+        dr = xa[i] - x0
+
+        # np.argmin returns the first (lowest-index) minimum
+        if desc:
+            j = i if dr <= dl else i - 1
+        else:
+            j = i - 1 if dl <= dr else i
+
+    if desc:
+        return N - 1 - j
+    return j
+
+def fftlog_j0(x, f, q=1.5):
+    r"""
+    Compute g(y) = \int_0^\infty f(x) j0(xy) dln(x) using FFTLog.
+
+    This is the transform needed to go between power spectra and
+    correlation functions, e.g., xi(R) = fftlog_j0(k, k**3 P(k)) / 2 pi^2.
+
+    .. note :: Input must be sampled uniformly in log(x). Results are
+        returned on the reciprocal grid, y = 1 / x[-1::-1], so they will
+        generally need to be interpolated onto scales of interest.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Log-uniformly spaced abscissae.
+    f : np.ndarray
+        Function to be transformed, sampled at `x`.
+    q : int, float
+        Power-law bias, i.e., we actually transform f(x) x^-q, which helps
+        suppress ringing. Must satisfy 0 < q < 2 (and q != 1).
+
+    Returns
+    -------
+    Tuple containing (y, g(y)).
+
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    N = x.size
+    lnx = np.log(x)
+    dlnx = (lnx[-1] - lnx[0]) / (N - 1.)
+
+    assert np.allclose(np.diff(lnx), dlnx, rtol=1e-6), \
+        "FFTLog requires log-uniform input!"
+
+    lny = -lnx[-1::-1]
+
+    # Mellin transform of j0, U(s) = Gamma(s - 1) sin(pi (s - 1) / 2),
+    # evaluated at s = q + i eta. Work in logs since the gamma function
+    # and sine under- and overflow, respectively, at large eta.
+    eta = 2. * np.pi * np.arange(N // 2 + 1) / (N * dlnx)
+    a = (q - 1.) + 1j * eta
+    z = 0.5 * np.pi * a
+    lnU = loggamma(a) - 1j * z + np.log(np.exp(2j * z) - 1.) - np.log(2j)
+
+    c = np.fft.rfft(f * np.exp(-q * lnx))
+    c *= np.exp(lnU - 1j * eta * (lnx[0] + lny[0]))
+
+    # Nyquist term must be real
+    if N % 2 == 0:
+        c[-1] = c[-1].real
+
+    g = np.fft.irfft(np.conj(c), n=N) * np.exp(-q * lny)
+
+    return np.exp(lny), g
+
 class LinearNDInterpolator(object):
     def __init__(self, axes, data, fill_values=None):
         """
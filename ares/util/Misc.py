@@ -13,6 +13,7 @@ Description:
 import os
 import subprocess
 import numpy as np
+from functools import reduce
 from ..data import ARES
 
 try:
@@ -45,8 +46,7 @@ def get_cmd_line_kwargs(argv):
             else:
                 cmd_line_kwargs[pre] = str(post)
         elif post[0] == '[':
-            vals = post[1:-1].split(',')
-            cmd_line_kwargs[pre] = np.array([float(val) for val in vals])
+            cmd_line_kwargs[pre] = np.array(post[1:-1].split(','), dtype=float)
         else:
             try:
                 cmd_line_kwargs[pre] = float(post)
@@ -56,6 +56,8 @@ def get_cmd_line_kwargs(argv):
 
     return cmd_line_kwargs
 
+_hash_cache = {}
+
 def get_hash(repo_path=ARES, repo_env=None):
     """
     Return the unique git hash associated with the HEAD of some repository.
@@ -92,27 +94,32 @@ def get_hash(repo_path=ARES, repo_env=None):
     assert (repo_path is not None) or (repo_env is not None), \
         "Must supply path to git repo or environment variable that points to it."
 
-    try:
-        cwd = os.getcwd()
+    if repo_env is not None:
+        PATH = os.environ.get(repo_env)
+    else:
+        PATH = repo_path
 
-        if repo_env is not None:
-            PATH = os.environ.get(repo_env)
-        else:
-            PATH = repo_path
+    # Unset environment variable: don't fall back on the current directory,
+    # which may be some other repo entirely.
+    if PATH is None:
+        print("Failure to obtain hash: ${} is not set.".format(repo_env))
+        return 'unknown'
 
-        os.chdir(PATH)
+    # HEAD won't change mid-run, so only ask git once per repo.
+    if PATH in _hash_cache:
+        return _hash_cache[PATH]
 
+    try:
         # git rev-parse HEAD
-        pipe = subprocess.Popen(["git", "rev-parse", "HEAD"],
-            stdout=subprocess.PIPE)
-
-        # Move back to where we were
-        os.chdir(cwd)
+        proc = subprocess.run(["git", "rev-parse", "HEAD"], cwd=PATH,
+            stdout=subprocess.PIPE, check=True)
     except Exception as err:
         print("Failure to obtain hash due to following error: {}".format(err))
         return 'unknown'
 
-    return pipe.stdout.read().strip()
+    _hash_cache[PATH] = proc.stdout.strip()
+
+    return _hash_cache[PATH]
 
 def num_freq_bins(Nx, zi=40, zf=10, Emin=2e2, Emax=3e4):
     """
@@ -123,48 +130,43 @@ def num_freq_bins(Nx, zi=40, zf=10, Emin=2e2, Emax=3e4):
     mapping between redshift and frequency.
 
     """
-    x = np.logspace(np.log10(1.+zf), np.log10(1.+zi), Nx)
-    R = x[1] / x[0]
-
-    # Create mapping to frequency space
-    Etmp = 1. * Emin
-    n = 1
-    while Etmp < Emax:
-        Etmp = Emin * R**(n - 1)
-        n += 1
+    # Common ratio of log-x grid, i.e., x[1] / x[0]
+    R = ((1. + zi) / (1. + zf))**(1. / (Nx - 1.))
+
+    # Create mapping to frequency space: need smallest n such that
+    # Emin * R**n >= Emax.
+    if Emin >= Emax:
+        return -1
 
-    # Subtract 2: 1 because we overshoot Emax in while loop, another because
-    # n is index-1-based (?)
+    n = int(np.ceil(np.log(Emax / Emin) / np.log(R)))
+
+    # Guard against round-off in the logs
+    while Emin * R**n < Emax:
+        n += 1
+    while n > 0 and Emin * R**(n - 1) >= Emax:
+        n -= 1
 
-    return n-2
+    return n
 
 def get_attribute(s, ob):
     """
     Break apart a string `s` and recursively fetch attributes from object `ob`.
     """
-    spart = s.partition('.')
-
-    f = ob
-    for part in spart:
-        if part == '.':
-            continue
-
-        f = f.__getattribute__(part)
-
-    return f
+    return reduce(getattr, s.split('.'), ob)
 
 def split_by_sign(x, y):
     """
     Split apart an array into its positive and negative chunks.
     """
 
-    splitter = np.diff(np.sign(y))
+    # Indices where the sign changes (zero counts as its own sign)
+    sign = np.sign(y)
+    splits = np.flatnonzero(sign[1:] != sign[:-1]) + 1
 
-    if np.all(splitter == 0):
+    if splits.size == 0:
         ych = [y]
         xch = [x]
     else:
-        splits = np.atleast_1d(np.argwhere(splitter != 0).squeeze()) + 1
         ych = np.split(y, splits)
         xch = np.split(x, splits)
 
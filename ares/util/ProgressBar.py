@@ -29,16 +29,18 @@ except ImportError:
 class ProgressBar(object):
     def __init__(self, maxval, name='ares', use=True):
         self.maxval = maxval            
-        self.use = use
+        
+        # Only the root processor ever draws anything
+        self.use = pb and (rank == 0) and use
         
         self.has_pb = False
-        if pb and rank == 0 and use:
+        if self.use:
             self.widget = ["{!s}: ".format(name), progressbar.Percentage(), ' ', \
               progressbar.Bar(marker='#'), ' ', \
               progressbar.ETA(), ' ']
 
     def start(self):
-        if pb and rank == 0 and self.use:
+        if self.use:
             self.pbar = progressbar.ProgressBar(widgets=self.widget,
                 max_value=self.maxval, redirect_stdout=False, 
                 term_width=width+1).start()                
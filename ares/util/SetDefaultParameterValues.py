@@ -442,6 +442,8 @@ def PowerSpectrumParameters():
      'ps_split_transform': True,
      'ps_fht_rtol': 1e-4,
      'ps_fht_atol': 1e-4,
+     # Can also be 'fftlog': much faster, requires log-uniform R (the default)
+     'ps_fht_method': 'clenshaw-curtis',
 
      'ps_include_lya_lc': False,
 
@@ -1258,6 +1260,9 @@ def HaloMassFunctionParameters():
 
     "hps_assume_linear": False,
 
+    # Number of processes to use in TabulatePS when not running with MPI
+    "hps_ncores": 1,
+
     'hps_dlnk': 0.001,
     'hps_dlnR': 0.001,
     'hps_lnk_min': -10.,
@@ -33,7 +33,11 @@ def test():
     beta_z = hydr.beta_a(z, Tk, 1.-xHI, ne, Ja)
     beta_T = hydr.beta_T(z, Tk, 1.-xHI, ne, Ja)
 
-    assert True
+    # All at once should give the same answer
+    betas = hydr.betas(z, Tk, 1.-xHI, ne, Ja)
+    assert np.allclose(betas['d'], beta_d)
+    assert np.allclose(betas['x'], beta_x)
+    assert np.allclose(betas['a'], beta_z)
 
 if __name__ == '__main__':
     test()
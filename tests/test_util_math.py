@@ -13,7 +13,8 @@ Description:
 import numpy as np
 from scipy.interpolate import interp1d
 from ares.util.Math import interp1d_wrapper, forward_difference, \
-    central_difference, five_pt_stencil, LinearNDInterpolator, smooth
+    central_difference, five_pt_stencil, LinearNDInterpolator, smooth, \
+    fftlog_j0, simpson_weights, nearest_index
 
 def test():
 
@@ -62,5 +63,29 @@ def test():
     func3d = LinearNDInterpolator([_x, _y, _z], g)
     g0 = func3d(np.array([0.5, 1.3, 1.5]))
 
+    # FFTLog: transform of a Gaussian is a Gaussian
+    k = np.exp(np.arange(-10, 10, 0.01))
+    R, cf = fftlog_j0(k, k**3 * np.exp(-0.5 * k**2))
+    ok = np.logical_and(R > 1e-2, R < 4)
+    assert np.allclose(cf[ok], np.sqrt(np.pi / 2.) * np.exp(-0.5 * R[ok]**2),
+        rtol=1e-4)
+
+    # Simpson's rule, with odd and even numbers of points
+    for N in [51, 50]:
+        x = np.linspace(0, np.pi, N)
+        assert abs(np.dot(simpson_weights(x), np.sin(x)) - 2.) < 1e-5
+
+    # Degenerate and non-uniform grids should match np.trapz
+    for x in [np.array([]), np.array([1.]), np.array([0., 2.]),
+        np.sort(np.random.rand(20))]:
+        y = np.cos(x)
+        assert np.allclose(np.dot(simpson_weights(x), y), np.trapz(y, x=x))
+
+    # Nearest-index lookups should match brute-force argmin, ties included
+    x = np.linspace(0, 10, 11)
+    for arr in [x, x[-1::-1]]:
+        for x0 in [-1, 0, 0.5, 3.2, 7.5, 10, 12]:
+            assert nearest_index(arr, x0) == np.argmin(np.abs(arr - x0))
+
 if __name__ == '__main__':
     test()
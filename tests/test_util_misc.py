@@ -10,8 +10,11 @@ Description:
 
 """
 
+import os
 import numpy as np
-from ares.util.Misc import get_cmd_line_kwargs, get_attribute, split_by_sign
+from ares.util import Misc
+from ares.util.Misc import get_cmd_line_kwargs, get_attribute, split_by_sign, \
+    num_freq_bins, get_hash
 
 def test():
 
@@ -29,6 +32,14 @@ def test():
     assert kwargs['float_var'] == 12.3
     assert np.all(kwargs['list_var'] == np.array([1,2,3]))
 
+    # Malformed lists should raise rather than be silently truncated
+    try:
+        get_cmd_line_kwargs(['scriptname', 'list_var=[1,2,a]'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Malformed list should raise ValueError.')
+
     x = np.arange(0, 6 * np.pi, 500)
     y = np.sin(x)
 
@@ -42,6 +53,36 @@ def test():
     assert np.all(np.sign(xch) == np.sign(xch[0]))
     assert np.all(np.sign(ych) == np.sign(ych[0]))
 
+    # Nested attribute lookup
+    class _Ob(object):
+        pass
+
+    ob = _Ob()
+    ob.a = _Ob()
+    ob.a.b = _Ob()
+    ob.a.b.c = 5
+    assert get_attribute('a.b.c', ob) == 5
+    assert get_attribute('a', ob) is ob.a
+
+    # Number of frequency bins should match brute-force search
+    for Nx in [50, 100, 400]:
+        for Emin, Emax in [(2e2, 3e4), (10.2, 13.6), (1e2, 1e2 * 1.05)]:
+            x = np.logspace(np.log10(11.), np.log10(41.), Nx)
+            R = x[1] / x[0]
+            n = 0
+            while Emin * R**n < Emax:
+                n += 1
+
+            assert num_freq_bins(Nx, Emin=Emin, Emax=Emax) == n
+
+def test_get_hash_unset_env():
+    # An unset environment variable shouldn't fall back to the cwd's repo
+    env = 'ARES_TEST_UNSET_REPO'
+    os.environ.pop(env, None)
+
+    assert get_hash(repo_path=None, repo_env=env) == 'unknown'
+    assert None not in Misc._hash_cache
 
 if __name__ == '__main__':
     test()
+    test_get_hash_unset_env()